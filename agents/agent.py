@@ -9,19 +9,92 @@ High-level flow:
 4) Repeat until final text answer or max turns reached.
 
 This class owns the LLM loop and is used by both CLI and API runtime paths.
+`run` is the blocking loop used by the CLI; `arun` is the async twin used by the API.
 """
 
+import asyncio
+import hashlib
+import importlib.util
 import logging
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 from typing import Any
 
+import httpx
+import orjson
 from google import genai
 from google.genai import types
 
 from stores.memory import MemoryStore
+from stores.response_cache import ResponseCacheStore
 from tools.registry import ToolRegistry
 
 
+def _dumps_text(value: Any) -> str:
+    """Serialize a tool result for the history digest."""
+    return orjson.dumps(value, default=str).decode("utf-8")
+
+
+# Whitespace runs collapsed to one space in log previews.
+_WS_RE = re.compile(r"\s+")
+
+
+def log_preview(text: str, max_len: int = 120) -> str:
+    """Short one-line preview of text for logs (shared by all agents)."""
+    # Normalize only a bounded window so huge outputs are not fully tokenized.
+    window = text[: max_len * 4]
+    clean = _WS_RE.sub(" ", window).strip()
+    if len(clean) <= max_len and len(window) == len(text):
+        return clean
+    return clean[: max_len - 3] + "..."
+
+
+# One Gemini client per process. Agents, planner/executor and router all share it,
+# so they reuse one keep-alive connection pool instead of opening their own.
+_shared_client: genai.Client | None = None
+_shared_client_lock = Lock()
+
+
+def _http_client_args() -> dict[str, Any]:
+    """httpx settings for the Gemini client: pooled keep-alive, HTTP/2 when available."""
+    args: dict[str, Any] = {
+        "limits": httpx.Limits(max_keepalive_connections=50, keepalive_expiry=120),
+    }
+    # httpx needs the optional `h2` package for HTTP/2.
+    if importlib.util.find_spec("h2") is not None:
+        args["http2"] = True
+    return args
+
+
+def _user_text_content(text: str) -> types.Content:
+    """Build a single-text user turn.
+
+    Uses the constructors directly instead of `Part.from_text`; validation is kept
+    because `model_construct` is not faster for these small models.
+    """
+    return types.Content(role="user", parts=[types.Part(text=text)])
+
+
+def get_gemini_client() -> genai.Client:
+    """Return the shared Gemini client, creating it on first use.
+
+    Credentials are checked at creation so missing keys fail only when an agent runs.
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            if not os.getenv("GOOGLE_API_KEY"):
+                raise RuntimeError("GOOGLE_API_KEY is not set.")
+            client_args = _http_client_args()
+            _shared_client = genai.Client(
+                http_options=types.HttpOptions(client_args=client_args, async_client_args=client_args)
+            )
+        return _shared_client
+
+
 class GeminiToolAgent:
     """Agent that orchestrates LLM <-> tools interaction.
 
@@ -31,6 +104,24 @@ class GeminiToolAgent:
     - looping until a final text response is produced.
     """
 
+    # Returned when the model keeps requesting tools past `max_turns`.
+    MAX_TURNS_MESSAGE = "Stopped after too many tool-call turns."
+
+    # Upper bound for concurrent tool executions within a single model turn.
+    _MAX_TOOL_WORKERS = 8
+
+    # Gemini rejects explicit caches below a minimum prefix size.
+    # Tokens are estimated as ~4 characters each to avoid an extra count_tokens call.
+    _MIN_CACHE_TOKENS = 2048
+    # Refresh cache TTL when it is this close (seconds) to expiring.
+    _CACHE_REFRESH_MARGIN = 60
+
+    # Prefix of the memory block sent before the prompt.
+    _MEMORY_HEADER = "Previous conversation context:\n"
+
+    # First line of the text block that replaces compacted tool turns.
+    _DIGEST_HEADER = "Earlier tool results (compacted):"
+
     def __init__(
         self,
         model: str,
@@ -38,6 +129,11 @@ class GeminiToolAgent:
         system_prompt: str | None = None,
         memory_store: MemoryStore | None = None,
         max_turns: int = 5,
+        context_cache_ttl: int = 0,
+        response_cache: ResponseCacheStore | None = None,
+        max_context_items: int = 0,
+        stream_responses: bool = False,
+        max_prompt_chars: int = 32000,
     ) -> None:
         # Gemini client reads credentials from environment (GOOGLE_API_KEY etc).
         # Client is created lazily to make startup/test paths safer.
@@ -46,15 +142,41 @@ class GeminiToolAgent:
         self._tool_registry = tool_registry
         self._system_prompt = system_prompt
         self._memory_store = memory_store
+        self._response_cache = response_cache
         self._max_turns = max(1, max_turns)
+        # 0 keeps the full tool history; otherwise older tool turns are compacted.
+        self._max_context_items = max(0, max_context_items)
+        # Streaming lets tool calls start while the model is still generating.
+        self._stream_responses = stream_responses
+        # Character budget for prompt + memory (~4 chars per token).
+        self._max_prompt_chars = max(1, max_prompt_chars)
         self._logger = logging.getLogger("agent")
 
+        # Explicit context cache for the static prefix (system prompt + tools).
+        # 0 disables caching; the cache is created lazily on the first run.
+        self._context_cache_ttl = max(0, context_cache_ttl)
+        self._cache_name: str | None = None
+        self._cache_expires_at = 0.0
+        self._cache_lock = Lock()
+
+        # Request config is static for the agent's lifetime; build it once.
+        # Tools are declared once in config.
+        # If system prompt is provided, pass it as `system_instruction`.
+        config_kwargs: dict[str, Any] = {"tools": tool_registry.build_tools()}
+        if system_prompt:
+            config_kwargs["system_instruction"] = system_prompt
+        # Only greedy (temperature 0) requests are replayable, so enabling the
+        # response cache pins it; otherwise Gemini's default sampling applies.
+        self._temperature: float | None = 0.0 if response_cache is not None else None
+        if self._temperature is not None:
+            config_kwargs["temperature"] = self._temperature
+        self._base_config = types.GenerateContentConfig(**config_kwargs)
+        self._cached_config: types.GenerateContentConfig | None = None
+
     def _get_client(self) -> genai.Client:
         """Create Gemini client on first use and validate credentials."""
         if self._client is None:
-            if not os.getenv("GOOGLE_API_KEY"):
-                raise RuntimeError("GOOGLE_API_KEY is not set.")
-            self._client = genai.Client()
+            self._client = get_gemini_client()
         return self._client
 
     def run(self, prompt: str) -> str:
@@ -67,117 +189,516 @@ class GeminiToolAgent:
         if not prompt:
             self._logger.warning("Empty prompt received; returning guidance message")
             return "Prompt is empty. Please provide a question."
+        if len(prompt) > self._max_prompt_chars:
+            self._logger.warning("Prompt too long: %s chars > %s", len(prompt), self._max_prompt_chars)
+            return self._prompt_too_long_message()
 
-        self._logger.info("Agent run started: model=%s prompt=%s", self._model, self._preview(prompt))
+        # Preview/keys formatting is skipped entirely when INFO logging is off.
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info("Agent run started: model=%s prompt=%s", self._model, log_preview(prompt))
+        config = self._build_config()
+        contents = self._build_contents(prompt)
+        base_items = len(contents)
 
-        # Tools are declared once in config.
-        # If system prompt is provided, pass it as `system_instruction`.
-        config_kwargs: dict[str, Any] = {"tools": self._tool_registry.build_tools()}
-        if self._system_prompt:
-            config_kwargs["system_instruction"] = self._system_prompt
-        config = types.GenerateContentConfig(**config_kwargs)
+        # Core loop: model -> optional tool calls -> model.
+        for turn_number in range(1, self._max_turns + 1):
+            self._logger.info("LLM turn %s/%s", turn_number, self._max_turns)
+            if self._stream_responses:
+                response, early_responses = self._generate_streaming(contents, config)
+            else:
+                response, early_responses = self._generate(contents, config), None
 
-        contents: list[types.Content] = []
+            # No function calls means model returned final text response.
+            if not response.function_calls:
+                return self._finish(prompt, response.text or "")
 
-        # Optional memory context. This helps single-agent mode keep short history.
-        memory_context = self._memory_store.format_for_prompt() if self._memory_store else ""
-        if memory_context:
-            self._logger.debug("Memory context attached: %s chars", len(memory_context))
-            contents.append(
-                types.Content(
-                    role="user",
-                    parts=[types.Part.from_text(text="Previous conversation context:\n" + memory_context)],
-                )
-            )
+            calls = self._extract_calls(response)
 
-        # Current user request.
-        contents.append(types.Content(role="user", parts=[types.Part.from_text(text=prompt)]))
+            # ToolRegistry always returns dict with either {"result": ...} or {"error": ...}.
+            # Tool calls within one turn are independent, so run them concurrently.
+            # `map` keeps results in the same order as the model's function calls.
+            if early_responses is not None:
+                # Already executed while the response was streaming.
+                tool_responses = early_responses
+            elif len(calls) > 1:
+                with ThreadPoolExecutor(max_workers=min(self._MAX_TOOL_WORKERS, len(calls))) as executor:
+                    tool_responses = list(executor.map(lambda item: self._tool_registry.execute(*item), calls))
+            else:
+                tool_responses = [self._tool_registry.execute(name, args) for name, args in calls]
+
+            self._append_tool_turn(contents, response, calls, tool_responses)
+            self._compact_contents(contents, base_items)
+
+        return self._stop_after_max_turns(prompt)
+
+    async def arun(self, prompt: str) -> str:
+        """Async variant of `run` built on the Gemini `aio` client.
+
+        Model calls are awaited directly and tool calls run in worker threads,
+        so many prompts can be in flight on one event loop.
+
+        Example:
+            await agent.arun("What is the weather in Tokyo?")
+        """
+        prompt = prompt.strip()
+        if not prompt:
+            self._logger.warning("Empty prompt received; returning guidance message")
+            return "Prompt is empty. Please provide a question."
+        if len(prompt) > self._max_prompt_chars:
+            self._logger.warning("Prompt too long: %s chars > %s", len(prompt), self._max_prompt_chars)
+            return self._prompt_too_long_message()
+
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info("Agent async run started: model=%s prompt=%s", self._model, log_preview(prompt))
+        # Config may create/refresh a context cache (blocking HTTP), keep it off the loop.
+        config = await asyncio.to_thread(self._build_config)
+        # Memory is read from SQLite; keep that off the loop too.
+        if self._memory_store:
+            contents = await asyncio.to_thread(self._build_contents, prompt)
+        else:
+            contents = self._build_contents(prompt)
+        base_items = len(contents)
 
-        # Core loop: model -> optional tool calls -> model.
         for turn_number in range(1, self._max_turns + 1):
             self._logger.info("LLM turn %s/%s", turn_number, self._max_turns)
-            client = self._get_client()
-            response = client.models.generate_content(
+            if self._stream_responses:
+                response, early_responses = await self._agenerate_streaming(contents, config)
+            else:
+                response, early_responses = await self._agenerate(contents, config), None
+
+            if not response.function_calls:
+                return await self._afinish(prompt, response.text or "")
+
+            calls = self._extract_calls(response)
+
+            if early_responses is not None:
+                tool_responses = early_responses
+            else:
+                # Async-capable tools share the event loop; blocking ones run in threads.
+                # gather keeps results in call order.
+                tool_responses = list(
+                    await asyncio.gather(
+                        *(self._tool_registry.aexecute(name, args) for name, args in calls)
+                    )
+                )
+
+            self._append_tool_turn(contents, response, calls, tool_responses)
+            self._compact_contents(contents, base_items)
+
+        if self._memory_store:
+            return await asyncio.to_thread(self._stop_after_max_turns, prompt)
+        return self._stop_after_max_turns(prompt)
+
+    def _generate(self, contents: list[types.Content], config: types.GenerateContentConfig) -> Any:
+        """Call Gemini, serving identical deterministic requests from the response cache."""
+        cache_key = self._response_cache_key(contents, config)
+        cached = self._read_cached_response(cache_key)
+        if cached is not None:
+            return cached
+
+        client = self._get_client()
+        response = client.models.generate_content(
+            model=self._model,
+            contents=contents,
+            config=config,
+        )
+        self._write_cached_response(cache_key, response)
+        return response
+
+    async def _agenerate(self, contents: list[types.Content], config: types.GenerateContentConfig) -> Any:
+        """Async variant of `_generate`."""
+        cache_key = self._response_cache_key(contents, config)
+        cached = await self._aread_cached_response(cache_key)
+        if cached is not None:
+            return cached
+
+        client = self._get_client()
+        response = await client.aio.models.generate_content(
+            model=self._model,
+            contents=contents,
+            config=config,
+        )
+        await self._awrite_cached_response(cache_key, response)
+        return response
+
+    def _generate_streaming(
+        self,
+        contents: list[types.Content],
+        config: types.GenerateContentConfig,
+    ) -> tuple[Any, list[dict[str, Any]] | None]:
+        """Stream one model turn and start each tool as soon as its call arrives.
+
+        Returns the assembled response plus tool results in call order, or
+        `None` results on a response-cache hit (the caller runs tools then).
+        """
+        cache_key = self._response_cache_key(contents, config)
+        cached = self._read_cached_response(cache_key)
+        if cached is not None:
+            return cached, None
+
+        client = self._get_client()
+        parts: list[types.Part] = []
+        with ThreadPoolExecutor(max_workers=self._MAX_TOOL_WORKERS) as executor:
+            futures = []
+            stream = client.models.generate_content_stream(
                 model=self._model,
                 contents=contents,
                 config=config,
             )
+            for chunk in stream:
+                for part in self._chunk_parts(chunk):
+                    parts.append(part)
+                    if part.function_call is not None:
+                        futures.append(
+                            executor.submit(
+                                self._tool_registry.execute,
+                                part.function_call.name or "unknown",
+                                part.function_call.args or {},
+                            )
+                        )
+            tool_responses = [future.result() for future in futures]
 
-            # No function calls means model returned final text response.
-            if not response.function_calls:
-                final_response = response.text or ""
-                self._logger.info(
-                    "LLM final response received: %s chars preview=%s",
-                    len(final_response),
-                    self._preview(final_response),
-                )
-                if self._memory_store:
-                    self._memory_store.add_interaction(prompt, final_response)
-                return final_response
+        response = self._assemble_streamed_response(parts)
+        self._write_cached_response(cache_key, response)
+        return response, tool_responses
 
-            self._logger.info("LLM requested %s tool call(s)", len(response.function_calls))
+    async def _agenerate_streaming(
+        self,
+        contents: list[types.Content],
+        config: types.GenerateContentConfig,
+    ) -> tuple[Any, list[dict[str, Any]] | None]:
+        """Async variant of `_generate_streaming`."""
+        cache_key = self._response_cache_key(contents, config)
+        cached = await self._aread_cached_response(cache_key)
+        if cached is not None:
+            return cached, None
 
-            # Candidate content can be absent on some edge responses; keep safe fallback.
-            function_call_content = (
-                response.candidates[0].content
-                if response.candidates and response.candidates[0].content is not None
-                else types.Content(role="model", parts=[])
+        client = self._get_client()
+        parts: list[types.Part] = []
+        tasks: list[asyncio.Task[dict[str, Any]]] = []
+        try:
+            stream = await client.aio.models.generate_content_stream(
+                model=self._model,
+                contents=contents,
+                config=config,
             )
+            async for chunk in stream:
+                for part in self._chunk_parts(chunk):
+                    parts.append(part)
+                    if part.function_call is not None:
+                        tasks.append(
+                            asyncio.create_task(
+                                self._tool_registry.aexecute(
+                                    part.function_call.name or "unknown",
+                                    part.function_call.args or {},
+                                )
+                            )
+                        )
+            tool_responses = list(await asyncio.gather(*tasks))
+        finally:
+            # If the stream fails, stop tools already started and collect their
+            # outcomes so no task is leaked or reported as never retrieved.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        response = self._assemble_streamed_response(parts)
+        await self._awrite_cached_response(cache_key, response)
+        return response, tool_responses
+
+    @staticmethod
+    def _chunk_parts(chunk: Any) -> list[types.Part]:
+        """Return content parts of one streamed chunk (empty for metadata-only chunks)."""
+        if not chunk.candidates or chunk.candidates[0].content is None:
+            return []
+        return list(chunk.candidates[0].content.parts or [])
+
+    @staticmethod
+    def _assemble_streamed_response(parts: list[types.Part]) -> types.GenerateContentResponse:
+        """Merge streamed parts into one response so the loop treats it like a normal one."""
+        return types.GenerateContentResponse(
+            candidates=[types.Candidate(content=types.Content(role="model", parts=parts))]
+        )
+
+    def _response_cache_key(
+        self,
+        contents: list[types.Content],
+        config: types.GenerateContentConfig,
+    ) -> str | None:
+        """Return SHA-256 key for (model, system prompt, tools, contents), or None.
+
+        Only temperature-0 requests are cached. Sampled ones, including the
+        model's default when no temperature is set, would hide legitimate variation.
+        """
+        if self._response_cache is None or config.temperature != 0:
+            return None
+
+        payload = {
+            "m": self._model,
+            "s": self._system_prompt or "",
+            "t": sorted(self._tool_registry.names()),
+            "c": [content.model_dump(mode="json", exclude_none=True) for content in contents],
+        }
+        encoded = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _read_cached_response(self, cache_key: str | None) -> types.GenerateContentResponse | None:
+        if cache_key is None or self._response_cache is None:
+            return None
+        cached = self._response_cache.get(cache_key)
+        if cached is None:
+            self._logger.debug("Response cache miss: key=%s", cache_key[:12])
+            return None
+        self._logger.info("Response cache hit: key=%s", cache_key[:12])
+        return types.GenerateContentResponse.model_validate_json(cached)
+
+    def _write_cached_response(self, cache_key: str | None, response: Any) -> None:
+        if cache_key is None or self._response_cache is None:
+            return
+        self._response_cache.set(cache_key, response.model_dump_json(exclude_none=True))
+
+    async def _aread_cached_response(self, cache_key: str | None) -> types.GenerateContentResponse | None:
+        """`_read_cached_response` in a worker thread (SQLite read + LRU touch)."""
+        if cache_key is None or self._response_cache is None:
+            return None
+        return await asyncio.to_thread(self._read_cached_response, cache_key)
+
+    async def _awrite_cached_response(self, cache_key: str | None, response: Any) -> None:
+        """`_write_cached_response` in a worker thread."""
+        if cache_key is None or self._response_cache is None:
+            return
+        await asyncio.to_thread(self._write_cached_response, cache_key, response)
+
+    def _build_config(self) -> types.GenerateContentConfig:
+        """Return request config: cached-content config when available, else the prebuilt one."""
+        # With an explicit cache, tools and system prompt live in the cache
+        # and are not re-sent (or re-billed at full price) on every turn.
+        cache_name = self._get_cached_content_name()
+        if cache_name:
+            if self._cached_config is None or self._cached_config.cached_content != cache_name:
+                self._cached_config = types.GenerateContentConfig(
+                    cached_content=cache_name,
+                    temperature=self._temperature,
+                )
+            return self._cached_config
+
+        return self._base_config
+
+    def _get_cached_content_name(self) -> str | None:
+        """Return a live explicit cache name, creating or refreshing it when needed.
+
+        Returns None (uncached mode) when caching is disabled, the static prefix is
+        too small to be cached, or the cache API call fails.
+        """
+        if not self._context_cache_ttl:
+            return None
+
+        with self._cache_lock:
+            now = time.monotonic()
+            if self._cache_name and now < self._cache_expires_at - self._CACHE_REFRESH_MARGIN:
+                return self._cache_name
+
+            client = self._get_client()
+            ttl = f"{self._context_cache_ttl}s"
+            try:
+                if self._cache_name:
+                    client.caches.update(
+                        name=self._cache_name,
+                        config=types.UpdateCachedContentConfig(ttl=ttl),
+                    )
+                    self._logger.info("Context cache TTL refreshed: name=%s", self._cache_name)
+                else:
+                    tools = self._tool_registry.build_tools()
+                    estimated_tokens = (
+                        len(self._system_prompt or "") + sum(len(tool.model_dump_json()) for tool in tools)
+                    ) // 4
+                    if estimated_tokens < self._MIN_CACHE_TOKENS:
+                        self._logger.info(
+                            "Context cache skipped: ~%s tokens below minimum %s",
+                            estimated_tokens,
+                            self._MIN_CACHE_TOKENS,
+                        )
+                        self._context_cache_ttl = 0
+                        return None
+
+                    cache = client.caches.create(
+                        model=self._model,
+                        config=types.CreateCachedContentConfig(
+                            system_instruction=self._system_prompt,
+                            tools=tools,
+                            ttl=ttl,
+                        ),
+                    )
+                    self._cache_name = cache.name
+                    self._logger.info("Context cache created: name=%s ttl=%s", cache.name, ttl)
+            except Exception:
+                # Caching is an optimization only; keep serving in uncached mode.
+                self._logger.warning("Context cache unavailable; using uncached requests", exc_info=True)
+                self._cache_name = None
+                self._context_cache_ttl = 0
+                return None
+
+            self._cache_expires_at = now + self._context_cache_ttl
+            return self._cache_name
+
+    def _build_contents(self, prompt: str) -> list[types.Content]:
+        """Build initial conversation: optional memory context + current prompt.
 
-            function_response_parts: list[types.Part] = []
-            for index, call in enumerate(response.function_calls, start=1):
-                name = self._get_call_name(call) or "unknown"
-                args = self._get_call_args(call)
+        Order matters for Gemini implicit prefix caching: the static part (system
+        prompt + tools) is in the config, memory follows oldest-first, and the
+        current prompt always comes last, so the history only ever grows at the end.
+        """
+        contents: list[types.Content] = []
+
+        # Optional memory context. This helps single-agent mode keep short history.
+        memory_context = self._memory_store.format_for_prompt() if self._memory_store else ""
+        if memory_context:
+            memory_context = self._fit_memory(memory_context, self._max_prompt_chars - len(prompt))
+        if memory_context:
+            self._logger.debug("Memory context attached: %s chars", len(memory_context))
+            contents.append(_user_text_content(self._MEMORY_HEADER + memory_context))
+
+        # Current user request.
+        contents.append(_user_text_content(prompt))
+        return contents
+
+    def _fit_memory(self, memory_context: str, budget: int) -> str:
+        """Drop the oldest memory lines until memory fits the remaining char budget.
+
+        Cuts happen at "User: " boundaries so whole exchanges are kept.
+        """
+        budget -= len(self._MEMORY_HEADER)
+        if len(memory_context) <= budget:
+            return memory_context
+        if budget <= 0:
+            return ""
+
+        tail = memory_context[-budget:]
+        boundary = tail.find("\nUser: ")
+        trimmed = tail[boundary + 1 :] if boundary != -1 else ""
+        self._logger.info("Memory context trimmed: %s -> %s chars", len(memory_context), len(trimmed))
+        return trimmed
+
+    def _prompt_too_long_message(self) -> str:
+        return f"Prompt is too long. Please keep it under {self._max_prompt_chars} characters."
+
+    def _extract_calls(self, response: Any) -> list[tuple[str, dict[str, Any]]]:
+        """Pull (name, args) pairs out of a model response and log them."""
+        self._logger.info("LLM requested %s tool call(s)", len(response.function_calls))
+        calls = [(self._call_name(call) or "unknown", self._call_args(call)) for call in response.function_calls]
+        if self._logger.isEnabledFor(logging.INFO):
+            for index, (name, args) in enumerate(calls, start=1):
                 self._logger.info(
                     "Executing tool call %s/%s: name=%s args=%s",
                     index,
-                    len(response.function_calls),
+                    len(calls),
                     name,
                     args,
                 )
+        return calls
+
+    def _append_tool_turn(
+        self,
+        contents: list[types.Content],
+        response: Any,
+        calls: list[tuple[str, dict[str, Any]]],
+        tool_responses: list[dict[str, Any]],
+    ) -> None:
+        """Append the model function-call turn and matching tool responses."""
+        # Candidate content can be absent on some edge responses; keep safe fallback.
+        function_call_content = (
+            response.candidates[0].content
+            if response.candidates and response.candidates[0].content is not None
+            else types.Content(role="model", parts=[])
+        )
 
-                # ToolRegistry always returns dict with either {"result": ...} or {"error": ...}.
-                tool_response = self._tool_registry.execute(name, args)
+        log_info = self._logger.isEnabledFor(logging.INFO)
+        function_response_parts: list[types.Part] = []
+        for (name, _), tool_response in zip(calls, tool_responses):
+            if log_info:
                 self._logger.info("Tool finished: name=%s keys=%s", name, list(tool_response.keys()))
-                function_response_parts.append(
-                    types.Part.from_function_response(name=name, response=tool_response)
-                )
+            function_response_parts.append(
+                types.Part.from_function_response(name=name, response=tool_response)
+            )
+
+        # Append both: model function call request + tool responses.
+        # Function responses must be attached as role="user" for this SDK/API flow.
+        contents.append(function_call_content)
+        contents.append(types.Content(role="user", parts=function_response_parts))
+        self._logger.debug("Conversation content items now: %s", len(contents))
+
+    def _compact_contents(self, contents: list[types.Content], base_items: int) -> None:
+        """Collapse the oldest tool turns into one text digest when history is too long.
+
+        Layout after compaction:
+            [memory?, prompt] + [digest] + [recent call/response pairs]
+        Call/response pairs are only dropped together, and the digest keeps the
+        tool results as text, so no extra LLM call is needed to summarize.
+        """
+        if not self._max_context_items or len(contents) <= self._max_context_items:
+            return
+
+        has_digest = len(contents) > base_items and self._is_digest(contents[base_items])
+        start = base_items + 1 if has_digest else base_items
+        pair_count = (len(contents) - start) // 2
+        keep_pairs = max(1, (self._max_context_items - base_items - 1) // 2)
+        if pair_count <= keep_pairs:
+            return
+
+        cut = start + 2 * (pair_count - keep_pairs)
+        lines: list[str] = []
+        if has_digest:
+            lines.extend(contents[base_items].parts[0].text.splitlines()[1:])
+        for content in contents[start:cut]:
+            for part in content.parts or []:
+                if part.function_response is not None:
+                    payload = _dumps_text(part.function_response.response)
+                    lines.append(f"- {part.function_response.name}: {payload}")
+
+        digest_text = "\n".join([self._DIGEST_HEADER, *lines])
+        contents[base_items:cut] = [_user_text_content(digest_text)]
+        self._logger.debug("Compacted %s tool turn(s); content items now: %s", (cut - start) // 2, len(contents))
 
-            # Append both: model function call request + tool responses.
-            # Function responses must be attached as role="user" for this SDK/API flow.
-            contents.append(function_call_content)
-            contents.append(types.Content(role="user", parts=function_response_parts))
-            self._logger.debug("Conversation content items now: %s", len(contents))
+    @classmethod
+    def _is_digest(cls, content: types.Content) -> bool:
+        parts = content.parts or []
+        return bool(parts) and (parts[0].text or "").startswith(cls._DIGEST_HEADER)
 
-        # Safety fallback if model keeps looping with tool calls.
-        final_response = "Stopped after too many tool-call turns."
+    def _finish(self, prompt: str, final_response: str) -> str:
+        """Log final answer and store it in memory."""
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info(
+                "LLM final response received: %s chars preview=%s",
+                len(final_response),
+                log_preview(final_response),
+            )
+        if self._memory_store:
+            self._memory_store.add_interaction(prompt, final_response)
+        return final_response
+
+    async def _afinish(self, prompt: str, final_response: str) -> str:
+        """Async `_finish`; the memory write runs in a worker thread."""
+        if self._memory_store:
+            return await asyncio.to_thread(self._finish, prompt, final_response)
+        return self._finish(prompt, final_response)
+
+    def _stop_after_max_turns(self, prompt: str) -> str:
+        """Safety fallback if model keeps looping with tool calls."""
+        final_response = self.MAX_TURNS_MESSAGE
         self._logger.warning(final_response)
         if self._memory_store:
             self._memory_store.add_interaction(prompt, final_response)
         return final_response
 
     @staticmethod
-    def _get_call_name(call: Any) -> str | None:
-        """Extract function name from SDK call object variants."""
-        if hasattr(call, "name") and call.name:
-            return call.name
-        if hasattr(call, "function_call") and getattr(call.function_call, "name", None):
-            return call.function_call.name
-        return None
+    def _call_name(call: Any) -> str | None:
+        """Extract function name from SDK call object variants (`call.name` or `call.function_call.name`)."""
+        return getattr(call, "name", None) or getattr(getattr(call, "function_call", None), "name", None)
 
     @staticmethod
-    def _get_call_args(call: Any) -> dict[str, Any]:
+    def _call_args(call: Any) -> dict[str, Any]:
         """Extract function args from SDK call object variants."""
-        if hasattr(call, "args") and call.args is not None:
-            return call.args
-        if hasattr(call, "function_call") and getattr(call.function_call, "args", None) is not None:
-            return call.function_call.args
-        return {}
-
-    @staticmethod
-    def _preview(text: str, max_len: int = 120) -> str:
-        """Short preview helper for cleaner logs."""
-        clean = " ".join(text.split())
-        if len(clean) <= max_len:
-            return clean
-        return clean[: max_len - 3] + "..."
+        args = getattr(call, "args", None)
+        if args is None:
+            args = getattr(getattr(call, "function_call", None), "args", None)
+        return args or {}
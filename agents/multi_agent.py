@@ -4,22 +4,62 @@
 
 Roles:
 1) Planner: turns user request into a short plan.
-2) Executor: follows plan and uses tools.
+2) Executor: follows plan, uses tools, and drafts the user-facing answer.
+
+The planner only gets a second (finalize) turn when the executor draft is not
+usable or when `planner_finalize=True`; this saves one LLM round-trip per run.
 
 Mailbox captures every step so you can inspect agent-to-agent dialog.
 This is useful for debugging and teaching multi-agent behavior.
 """
 
+import asyncio
 import logging
 import uuid
 
-from agents.agent import GeminiToolAgent
+from agents.agent import GeminiToolAgent, log_preview
 from stores.mailbox import MailboxStore
+from stores.response_cache import ResponseCacheStore
 from tools.registry import ToolRegistry
 
+# Prompt layout: static preamble first, then "---", then per-request data.
+# Gemini implicit caching matches on request prefixes, so keeping the stable text
+# in front (and identical for both planner calls) lets later calls reuse it.
+_SEPARATOR = "\n---\n"
+_PLANNER_PREAMBLE = (
+    "Planner task. Below the separator you get the user request, followed by either "
+    "a request for a plan or the executor result to turn into the final answer."
+)
+_EXECUTOR_PREAMBLE = (
+    "Executor task. Below the separator you get the user request and the plan to execute."
+)
+
+# Full prompt templates, built once at import time. Values are passed to
+# str.format as arguments, so braces inside user text are safe.
+_PLAN_TEMPLATE = (
+    _PLANNER_PREAMBLE
+    + _SEPARATOR
+    + "User request:\n{prompt}\n\n"
+    "Return a short numbered plan for the executor."
+)
+_EXECUTE_TEMPLATE = (
+    _EXECUTOR_PREAMBLE
+    + _SEPARATOR
+    + "User request:\n{prompt}\n\n"
+    "Plan:\n{plan}\n\n"
+    "Execute the plan and write the final response for the user."
+)
+_FINALIZE_TEMPLATE = (
+    _PLANNER_PREAMBLE
+    + _SEPARATOR
+    + "User request:\n{prompt}\n\n"
+    "Executor result:\n{result}\n\n"
+    "Write the final response for the user."
+)
+
 
 class MultiAgentCoordinator:
-    """Coordinator for planner -> executor -> planner cycle.
+    """Coordinator for planner -> executor (-> planner) cycle.
 
     The coordinator:
     - creates a planner agent with no tools,
@@ -34,9 +74,16 @@ class MultiAgentCoordinator:
         executor_registry: ToolRegistry,
         mailbox: MailboxStore,
         max_turns: int = 5,
+        context_cache_ttl: int = 0,
+        response_cache: ResponseCacheStore | None = None,
+        planner_finalize: bool = False,
+        max_context_items: int = 0,
+        stream_responses: bool = False,
+        max_prompt_chars: int = 32000,
     ) -> None:
         self._logger = logging.getLogger("agent.coordinator")
         self._mailbox = mailbox
+        self._planner_finalize = planner_finalize
 
         # Planner should not use tools; it should produce a clear plan.
         self._planner = GeminiToolAgent(
@@ -47,6 +94,11 @@ class MultiAgentCoordinator:
                 "Do not call tools."
             ),
             max_turns=max_turns,
+            context_cache_ttl=context_cache_ttl,
+            response_cache=response_cache,
+            max_context_items=max_context_items,
+            stream_responses=stream_responses,
+            max_prompt_chars=max_prompt_chars,
         )
 
         # Executor can use tools and convert plan into concrete results.
@@ -54,60 +106,103 @@ class MultiAgentCoordinator:
             model=model,
             tool_registry=executor_registry,
             system_prompt=(
-                "You are an executor. Follow the plan, call tools when needed, and return results."
+                "You are an executor. Follow the plan, call tools when needed, and "
+                "write the final response for the user."
             ),
             max_turns=max_turns,
+            context_cache_ttl=context_cache_ttl,
+            response_cache=response_cache,
+            max_context_items=max_context_items,
+            stream_responses=stream_responses,
+            max_prompt_chars=max_prompt_chars,
         )
 
     def run(self, prompt: str) -> str:
         """Run one multi-agent session and return final user-facing response."""
+        thread_id = self._start_thread(prompt)
+
+        # Step 2: planner creates plan.
+        plan = self._planner.run(self._plan_prompt(prompt))
+        self._record_plan(prompt, plan, thread_id)
+
+        # Step 3: executor performs plan, can call tools, and drafts the answer.
+        result = self._executor.run(self._execute_prompt(prompt, plan))
+        if not self._needs_planner_finalize(result):
+            return self._record_final("executor", result, thread_id)
+
+        # Step 4 (optional): planner converts executor result into final answer for user.
+        self._record_result(result, thread_id)
+        final_response = self._planner.run(self._finalize_prompt(prompt, result))
+        return self._record_final("planner", final_response, thread_id)
+
+    async def arun(self, prompt: str) -> str:
+        """Async variant of `run`; steps are the same, agent calls are awaited.
+
+        Mailbox writes (which may flush to SQLite) run in worker threads.
+        """
+        thread_id = await asyncio.to_thread(self._start_thread, prompt)
+
+        plan = await self._planner.arun(self._plan_prompt(prompt))
+        await asyncio.to_thread(self._record_plan, prompt, plan, thread_id)
+
+        result = await self._executor.arun(self._execute_prompt(prompt, plan))
+        if not self._needs_planner_finalize(result):
+            return await asyncio.to_thread(self._record_final, "executor", result, thread_id)
+
+        await asyncio.to_thread(self._record_result, result, thread_id)
+        final_response = await self._planner.arun(self._finalize_prompt(prompt, result))
+        return await asyncio.to_thread(self._record_final, "planner", final_response, thread_id)
+
+    def _needs_planner_finalize(self, result: str) -> bool:
+        """Decide whether the planner must rewrite the executor draft.
+
+        Empty drafts and max-turn fallbacks are not user-ready answers.
+        """
+        if self._planner_finalize:
+            return True
+        draft = result.strip()
+        return not draft or draft == GeminiToolAgent.MAX_TURNS_MESSAGE
+
+    def _start_thread(self, prompt: str) -> str:
+        """Open a new mailbox thread with the user request."""
         thread_id = str(uuid.uuid4())
-        self._logger.info("Multi-agent run started: thread=%s prompt=%s", thread_id, self._preview(prompt))
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info("Multi-agent run started: thread=%s prompt=%s", thread_id, log_preview(prompt))
 
         # Step 1: user request enters mailbox for traceability.
         self._mailbox.send("user", "planner", {"prompt": prompt}, thread_id)
+        return thread_id
 
-        # Step 2: planner creates plan.
-        plan = self._planner.run(
-            "User request:\n"
-            f"{prompt}\n\n"
-            "Return a short numbered plan for the executor."
-        )
+    def _record_plan(self, prompt: str, plan: str, thread_id: str) -> None:
         self._logger.info("Planner produced plan: %s chars", len(plan))
         self._mailbox.send("planner", "executor", {"plan": plan, "prompt": prompt}, thread_id)
 
-        # Step 3: executor performs plan and can call tools.
-        result = self._executor.run(
-            "User request:\n"
-            f"{prompt}\n\n"
-            "Plan:\n"
-            f"{plan}\n\n"
-            "Execute the plan and provide results."
-        )
+    def _record_result(self, result: str, thread_id: str) -> None:
         self._logger.info("Executor produced result: %s chars", len(result))
         self._mailbox.send("executor", "planner", {"result": result}, thread_id)
 
-        # Step 4: planner converts executor result into final answer for user.
-        final_response = self._planner.run(
-            "User request:\n"
-            f"{prompt}\n\n"
-            "Executor result:\n"
-            f"{result}\n\n"
-            "Write the final response for the user."
-        )
-        self._mailbox.send("planner", "user", {"final": final_response}, thread_id)
-
-        self._logger.info(
-            "Multi-agent run completed: thread=%s final_chars=%s preview=%s",
-            thread_id,
-            len(final_response),
-            self._preview(final_response),
-        )
+    def _record_final(self, sender: str, final_response: str, thread_id: str) -> str:
+        self._mailbox.send(sender, "user", {"final": final_response}, thread_id)
+        # Persist the whole thread trace in one transaction at end of run.
+        self._mailbox.flush()
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info(
+                "Multi-agent run completed: thread=%s final_by=%s final_chars=%s preview=%s",
+                thread_id,
+                sender,
+                len(final_response),
+                log_preview(final_response),
+            )
         return final_response
 
     @staticmethod
-    def _preview(text: str, max_len: int = 120) -> str:
-        clean = " ".join(text.split())
-        if len(clean) <= max_len:
-            return clean
-        return clean[: max_len - 3] + "..."
+    def _plan_prompt(prompt: str) -> str:
+        return _PLAN_TEMPLATE.format(prompt=prompt)
+
+    @staticmethod
+    def _execute_prompt(prompt: str, plan: str) -> str:
+        return _EXECUTE_TEMPLATE.format(prompt=prompt, plan=plan)
+
+    @staticmethod
+    def _finalize_prompt(prompt: str, result: str) -> str:
+        return _FINALIZE_TEMPLATE.format(prompt=prompt, result=result)
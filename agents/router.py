@@ -4,21 +4,30 @@
 
 This module introduces a lightweight routing step before running the agent:
 1) The router inspects the user prompt.
-2) It decides between:
+2) A cheap local heuristic handles obvious prompts without an LLM call.
+3) Otherwise the router model decides between:
    - "direct": run a single agent (fast path).
    - "plan": run a planner/executor multi-agent flow (slow but thorough).
-3) The coordinator runs the chosen path and returns the final response.
+4) The coordinator runs the chosen path and returns the final response.
 
-The router itself uses Gemini with a constrained JSON output to keep
-its decision machine-readable and easy to debug.
+The router itself calls Gemini directly (no tool loop) with a JSON response
+schema, so its decision is machine-readable and easy to debug.
 """
 
-import json
+import hashlib
 import logging
+import re
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Protocol
+from threading import Lock
+from typing import Any, Literal, Protocol
 
-from agents.agent import GeminiToolAgent
+import orjson
+from google import genai
+from google.genai import types
+from pydantic import BaseModel
+
+from agents.agent import get_gemini_client
 from tools.registry import ToolRegistry
 
 
@@ -37,29 +46,44 @@ class RouteDecision:
     raw: str
 
 
+class RouteDecisionModel(BaseModel):
+    """Response schema the router model must follow."""
+
+    route: Literal["direct", "plan"]
+    reason: str
+
+
 class RunnerProtocol(Protocol):
-    """Simple protocol for any runner that exposes .run(prompt)."""
+    """Simple protocol for any runner that exposes .run(prompt) and .arun(prompt)."""
 
     def run(self, prompt: str) -> str:
         ...
 
+    async def arun(self, prompt: str) -> str:
+        ...
+
+
+# Known route aliases -> normalized route. Built once at import time.
+_ROUTE_ALIASES = {
+    "direct": "direct",
+    "single": "direct",
+    "fast": "direct",
+    "plan": "plan",
+    "planner": "plan",
+    "multi": "plan",
+    "plan-execute": "plan",
+    "plan_execute": "plan",
+}
+
+# Fallback keywords for non-JSON output, matched in one pass ("planner" contains "plan").
+_FALLBACK_KEYWORDS_RE = re.compile(r"direct|plan|multi", re.IGNORECASE)
+
 
 def _normalize_route(value: str | None) -> str | None:
     """Normalize raw route value into a known route or None."""
     if not value:
         return None
-    cleaned = value.strip().lower()
-    mapping = {
-        "direct": "direct",
-        "single": "direct",
-        "fast": "direct",
-        "plan": "plan",
-        "planner": "plan",
-        "multi": "plan",
-        "plan-execute": "plan",
-        "plan_execute": "plan",
-    }
-    return mapping.get(cleaned)
+    return _ROUTE_ALIASES.get(value.strip().lower())
 
 
 def _extract_json(text: str) -> str | None:
@@ -85,8 +109,8 @@ def parse_router_response(text: str) -> RouteDecision | None:
     snippet = _extract_json(raw)
     if snippet:
         try:
-            data = json.loads(snippet)
-        except json.JSONDecodeError:
+            data = orjson.loads(snippet)
+        except orjson.JSONDecodeError:
             data = None
 
         if isinstance(data, dict):
@@ -96,47 +120,178 @@ def parse_router_response(text: str) -> RouteDecision | None:
                 return RouteDecision(route=route, reason=reason, raw=raw)
 
     # Fallback keyword detection for non-JSON responses.
-    lowered = raw.lower()
-    if "direct" in lowered:
+    # "direct" wins over plan keywords regardless of position.
+    keywords = {match.lower() for match in _FALLBACK_KEYWORDS_RE.findall(raw)}
+    if "direct" in keywords:
         return RouteDecision(route="direct", reason="Fallback: matched keyword 'direct'.", raw=raw)
-    if "plan" in lowered or "planner" in lowered or "multi" in lowered:
+    if keywords:
         return RouteDecision(route="plan", reason="Fallback: matched keyword 'plan'.", raw=raw)
 
     return None
 
 
+# Heuristic pre-filter settings.
+# Tool-name parts that say nothing about the domain (get_current_weather -> "weather").
+_GENERIC_TOOL_NAME_PARTS = frozenset({"get", "set", "list", "fetch", "current", "batch"})
+# Connectors that usually mean a multi-step request.
+_MULTI_STEP_RE = re.compile(r"\b(and|then|after|before|compare|versus|vs)\b", re.IGNORECASE)
+_WORD_RE = re.compile(r"\w+")
+# Prompts up to this many words with no tool/multi-step signal go direct.
+# Only applied to ASCII prompts: the connector list is English, and scripts
+# without spaces (e.g. Japanese) would count a whole sentence as one word.
+_QUICK_DIRECT_MAX_WORDS = 8
+
+
+def tool_keywords(registry: ToolRegistry) -> frozenset[str]:
+    """Derive domain keywords from tool names.
+
+    Example: ["get_current_weather", "get_weather_forecast"] -> {"weather", "forecast"}
+    """
+    return frozenset(
+        part
+        for name in registry.names()
+        for part in name.lower().split("_")
+        if part and part not in _GENERIC_TOOL_NAME_PARTS
+    )
+
+
+def quick_route(prompt: str, keywords: frozenset[str]) -> RouteDecision | None:
+    """Classify obvious prompts locally; return None when the LLM router should decide.
+
+    - Mentions a tool domain (e.g. "weather") or multi-step connectors -> "plan".
+    - Short ASCII prompt with neither signal (e.g. "hi", "what is 2+2") -> "direct".
+    - Anything else, including prompts in other scripts, goes to the LLM router.
+    """
+    words = _WORD_RE.findall(prompt.lower())
+    matched = keywords.intersection(words)
+    if matched:
+        return RouteDecision(
+            route="plan",
+            reason=f"Heuristic: matched tool keyword(s) {sorted(matched)}.",
+            raw="",
+        )
+    if not words or not prompt.isascii() or _MULTI_STEP_RE.search(prompt):
+        return None
+    if len(words) <= _QUICK_DIRECT_MAX_WORDS:
+        return RouteDecision(route="direct", reason="Heuristic: short prompt without tool keywords.", raw="")
+    return None
+
+
 class RouterAgent:
     """LLM-backed router that decides direct vs plan execution."""
 
-    def __init__(self, model: str, max_turns: int = 1) -> None:
-        # Router should not use tools. It only decides on the execution path.
-        self._agent = GeminiToolAgent(
-            model=model,
-            tool_registry=ToolRegistry([]),
-            system_prompt=(
-                "You are a router. Decide how to handle the user request. "
-                "Return JSON only: {\"route\": \"direct\"|\"plan\", "
-                "\"reason\": \"short explanation\"}. "
-                "Use 'direct' for simple questions that do not need tools or multi-step planning. "
-                "Use 'plan' when tools, external data, or multi-step reasoning are likely needed."
-            ),
-            max_turns=max(1, max_turns),
+    _SYSTEM_PROMPT = (
+        "You are a router. Decide how to handle the user request. "
+        "Return JSON only: {\"route\": \"direct\"|\"plan\", "
+        "\"reason\": \"short explanation\"}. "
+        "Use 'direct' for simple questions that do not need tools or multi-step planning. "
+        "Use 'plan' when tools, external data, or multi-step reasoning are likely needed."
+    )
+    _PARSE_FAILURE_REASON = "Fallback: unable to parse router response."
+    _ROUTING_TEMPLATE = "User request:\n{prompt}\n\nReturn routing JSON only."
+
+    def __init__(self, model: str, decision_cache_size: int = 1024) -> None:
+        # Router should not use tools. It only decides on the execution path,
+        # so it calls Gemini once with a JSON response schema instead of the tool loop.
+        self._model = model
+        self._client: genai.Client | None = None
+        self._config = types.GenerateContentConfig(
+            system_instruction=self._SYSTEM_PROMPT,
+            response_mime_type="application/json",
+            response_schema=RouteDecisionModel,
         )
         self._logger = logging.getLogger("agent.router")
 
+        # LRU cache of decisions keyed by normalized prompt hash (0 disables).
+        # Repeated prompts skip the router LLM call entirely.
+        self._decision_cache: OrderedDict[str, RouteDecision] = OrderedDict()
+        self._decision_cache_size = max(0, decision_cache_size)
+        self._decision_cache_lock = Lock()
+
+    def _get_client(self) -> genai.Client:
+        """Create Gemini client on first use and validate credentials."""
+        if self._client is None:
+            self._client = get_gemini_client()
+        return self._client
+
     def decide(self, prompt: str) -> RouteDecision:
         """Return a normalized routing decision for a user prompt."""
-        raw = self._agent.run(
-            "User request:\n"
-            f"{prompt}\n\n"
-            "Return routing JSON only."
+        cache_key = self._cache_key(prompt)
+        cached = self._cached_decision(cache_key)
+        if cached is not None:
+            return cached
+
+        response = self._get_client().models.generate_content(
+            model=self._model,
+            contents=self._routing_prompt(prompt),
+            config=self._config,
         )
-        decision = parse_router_response(raw)
+        return self._store_decision(cache_key, self._to_decision(response))
+
+    async def adecide(self, prompt: str) -> RouteDecision:
+        """Async variant of `decide`."""
+        cache_key = self._cache_key(prompt)
+        cached = self._cached_decision(cache_key)
+        if cached is not None:
+            return cached
+
+        response = await self._get_client().aio.models.generate_content(
+            model=self._model,
+            contents=self._routing_prompt(prompt),
+            config=self._config,
+        )
+        return self._store_decision(cache_key, self._to_decision(response))
+
+    @staticmethod
+    def _cache_key(prompt: str) -> str:
+        """Hash the prompt after case/whitespace normalization.
+
+        Example: "  Weather in  Tokyo?" and "weather in tokyo?" share one key.
+        """
+        normalized = " ".join(prompt.lower().split())
+        return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _cached_decision(self, cache_key: str) -> RouteDecision | None:
+        with self._decision_cache_lock:
+            decision = self._decision_cache.get(cache_key)
+            if decision is not None:
+                self._decision_cache.move_to_end(cache_key)
+        if decision is not None:
+            self._logger.info("Router decision cache hit: route=%s", decision.route)
+        return decision
+
+    def _store_decision(self, cache_key: str, decision: RouteDecision) -> RouteDecision:
+        # Parse-failure fallbacks are not cached so the next attempt can succeed.
+        if not self._decision_cache_size or decision.reason == self._PARSE_FAILURE_REASON:
+            return decision
+        with self._decision_cache_lock:
+            self._decision_cache[cache_key] = decision
+            self._decision_cache.move_to_end(cache_key)
+            while len(self._decision_cache) > self._decision_cache_size:
+                self._decision_cache.popitem(last=False)
+        return decision
+
+    @classmethod
+    def _routing_prompt(cls, prompt: str) -> str:
+        return cls._ROUTING_TEMPLATE.format(prompt=prompt)
+
+    def _to_decision(self, response: Any) -> RouteDecision:
+        raw = response.text or ""
+        parsed = response.parsed
+        if isinstance(parsed, RouteDecisionModel):
+            decision: RouteDecision | None = RouteDecision(
+                route=parsed.route,
+                reason=parsed.reason.strip() or "No reason provided.",
+                raw=raw,
+            )
+        else:
+            # Schema output should always parse; keep text parsing as a safety net.
+            decision = parse_router_response(raw)
         if decision is None:
             # Safe default: fall back to plan for thorough execution.
             decision = RouteDecision(
                 route="plan",
-                reason="Fallback: unable to parse router response.",
+                reason=self._PARSE_FAILURE_REASON,
                 raw=raw,
             )
         self._logger.info("Router decision: route=%s reason=%s", decision.route, decision.reason)
@@ -151,15 +306,18 @@ class RouterCoordinator:
         router: RouterAgent,
         direct_agent: RunnerProtocol,
         plan_agent: RunnerProtocol,
+        tool_registry: ToolRegistry | None = None,
     ) -> None:
         self._router = router
         self._direct_agent = direct_agent
         self._plan_agent = plan_agent
         self._logger = logging.getLogger("agent.router.coordinator")
+        # Keywords for the local pre-filter; without a registry only length is used.
+        self._tool_keywords = tool_keywords(tool_registry) if tool_registry else frozenset()
 
     def run(self, prompt: str) -> str:
         """Route a prompt and return the final response."""
-        decision = self._router.decide(prompt)
+        decision = self._quick_route(prompt) or self._router.decide(prompt)
 
         if decision.route == "direct":
             self._logger.info("Routing to direct agent")
@@ -167,3 +325,20 @@ class RouterCoordinator:
 
         self._logger.info("Routing to plan-execute coordinator")
         return self._plan_agent.run(prompt)
+
+    async def arun(self, prompt: str) -> str:
+        """Async variant of `run`."""
+        decision = self._quick_route(prompt) or await self._router.adecide(prompt)
+
+        if decision.route == "direct":
+            self._logger.info("Routing to direct agent")
+            return await self._direct_agent.arun(prompt)
+
+        self._logger.info("Routing to plan-execute coordinator")
+        return await self._plan_agent.arun(prompt)
+
+    def _quick_route(self, prompt: str) -> RouteDecision | None:
+        decision = quick_route(prompt, self._tool_keywords)
+        if decision is not None:
+            self._logger.info("Router heuristic decision: route=%s reason=%s", decision.route, decision.reason)
+        return decision
@@ -14,16 +14,18 @@ Request example:
     {"prompt": "What is the weather in Tokyo?"}
 """
 
+import inspect
 import logging
-from collections.abc import Callable
-from threading import Lock
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 
 from core.config import AppConfig
-from core.runtime import build_runner, configure_logging
+from core.runtime import AsyncRunner, Runner, build_async_runner, configure_logging
+from tools.weather import aclose_async_http_clients
 
 
 class ChatRequest(BaseModel):
@@ -51,13 +53,15 @@ class HealthResponse(BaseModel):
 
 
 def create_app(
-    runner: Callable[[str], str] | None = None,
+    runner: Runner | AsyncRunner | None = None,
     agent_mode: str | None = None,
     model: str | None = None,
 ) -> FastAPI:
     """Create FastAPI app.
 
     Optional runner injection keeps tests fast and independent of external APIs.
+    Both sync runners (`prompt -> str`) and async runners (`async prompt -> str`)
+    are accepted.
     """
     logger = logging.getLogger("agent.api")
 
@@ -65,7 +69,7 @@ def create_app(
         # Build runtime once during app startup.
         config = AppConfig.from_env()
         configure_logging(config)
-        runner, agent_mode = build_runner(config)
+        runner, agent_mode = build_async_runner(config)
         model = config.model
     else:
         # Tests or custom wiring can inject runner + metadata.
@@ -74,16 +78,22 @@ def create_app(
         if model is None:
             model = "custom"
 
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        yield
+        # Release pooled WeatherAPI connections owned by the server's event loop.
+        await aclose_async_http_clients()
+
     app = FastAPI(
         title="Gemini Tool Agent API",
         version="1.0.0",
+        lifespan=lifespan,
     )
 
     # `app.state` keeps shared runtime objects.
     # `app.state` keeps shared runtime objects for the life of the server.
     app.state.runner = runner
-    # Lock protects file-backed stores during concurrent requests.
-    app.state.runner_lock = Lock()
+    # No API-wide lock: stores serialize their own writes, so requests run concurrently.
     app.state.agent_mode = agent_mode
     app.state.model = model
 
@@ -100,15 +110,13 @@ def create_app(
 
         logger.info("/chat request received: prompt_chars=%s mode=%s", len(prompt), app.state.agent_mode)
 
-        def _run_agent() -> str:
-            # File-based memory/mailbox stores are mutable; serialize runs.
-            # This prevents race conditions when multiple requests arrive at once.
-            with app.state.runner_lock:
-                return app.state.runner(prompt)
-
         try:
-            # Run blocking agent code in threadpool to keep event loop responsive.
-            response_text = await run_in_threadpool(_run_agent)
+            if inspect.iscoroutinefunction(app.state.runner):
+                # Async runner awaits Gemini directly; requests run concurrently.
+                response_text = await app.state.runner(prompt)
+            else:
+                # Run blocking agent code in threadpool to keep event loop responsive.
+                response_text = await run_in_threadpool(app.state.runner, prompt)
         except Exception as exc:
             logger.exception("Chat request failed")
             raise HTTPException(status_code=500, detail=f"Agent execution failed: {exc}") from exc
@@ -4,6 +4,13 @@ Exports configuration and runtime helpers for CLI/API entrypoints.
 """
 
 from .config import AppConfig
-from .runtime import Runner, build_runner, configure_logging
+from .runtime import AsyncRunner, Runner, build_async_runner, build_runner, configure_logging
 
-__all__ = ["AppConfig", "Runner", "build_runner", "configure_logging"]
+__all__ = [
+    "AppConfig",
+    "AsyncRunner",
+    "Runner",
+    "build_async_runner",
+    "build_runner",
+    "configure_logging",
+]
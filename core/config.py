@@ -17,29 +17,65 @@ Example .env:
 
 import logging
 import os
+from collections.abc import Mapping
 from dataclasses import dataclass
 
-try:
-    from dotenv import load_dotenv
-except ImportError:
-    load_dotenv = None
-
-if load_dotenv is not None:
-    # Automatically load .env (if present) for local runs.
-    # Shell variables still have priority by default.
-    load_dotenv()
+_DOTENV_SENTINEL = "_DOTENV_LOADED"
 
 LOGGER = logging.getLogger("agent.config")
 
+# Every env var AppConfig reads; the cached config is reused while these are unchanged.
+_CONFIG_ENV_KEYS = (
+    "GEMINI_MODEL",
+    "WEATHERAPI_BASE_URL",
+    "WEATHERAPI_KEY",
+    "LOG_LEVEL",
+    "LOG_FILE",
+    "MEMORY_FILE",
+    "MEMORY_MAX_ENTRIES",
+    "MAILBOX_FILE",
+    "AGENT_MODE",
+    "MAX_TURNS",
+    "MAX_CONTEXT_ITEMS",
+    "STREAM_RESPONSES",
+    "MAX_PROMPT_CHARS",
+    "CONTEXT_CACHE_TTL",
+    "RESPONSE_CACHE_FILE",
+    "RESPONSE_CACHE_TTL",
+    "RESPONSE_CACHE_MAX_ENTRIES",
+    "PLANNER_FINALIZE",
+    "GOOGLE_API_KEY",
+)
+
+_cached_config: "tuple[dict[str, str], AppConfig] | None" = None
+
+
+def _load_dotenv_once() -> None:
+    """Load .env (if present) on first config read, once per process tree.
+
+    Shell variables still have priority by default.
+    The dotenv import is deferred until here, and `USE_DOTENV=0` skips it
+    entirely for deployments that set real env vars. The sentinel is inherited
+    by child processes (e.g. API reload workers), so the file is parsed once.
+    """
+    if os.environ.get(_DOTENV_SENTINEL) or os.environ.get("USE_DOTENV", "1") == "0":
+        return
+    os.environ[_DOTENV_SENTINEL] = "1"
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv()
+
 
-def _read_int_env(name: str, default: int) -> int:
+def _read_int_env(env: Mapping[str, str], name: str, default: int) -> int:
     """Read integer env var with fallback + warning on invalid values.
 
     Example:
     - MAX_TURNS=8   -> 8
     - MAX_TURNS=abc -> warning + default
     """
-    raw_value = os.getenv(name)
+    raw_value = env.get(name)
     if raw_value is None:
         return default
     try:
@@ -49,6 +85,25 @@ def _read_int_env(name: str, default: int) -> int:
         return default
 
 
+def _read_bool_env(env: Mapping[str, str], name: str, default: bool) -> bool:
+    """Read boolean env var with fallback + warning on invalid values.
+
+    Example:
+    - PLANNER_FINALIZE=true -> True
+    - PLANNER_FINALIZE=0    -> False
+    """
+    raw_value = env.get(name)
+    if raw_value is None:
+        return default
+    cleaned = raw_value.strip().lower()
+    if cleaned in {"1", "true", "yes", "on"}:
+        return True
+    if cleaned in {"0", "false", "no", "off"}:
+        return False
+    LOGGER.warning("Invalid boolean %s=%r. Using default=%s.", name, raw_value, default)
+    return default
+
+
 @dataclass(frozen=True)
 class AppConfig:
     """Immutable runtime configuration used by CLI and API entrypoints.
@@ -73,6 +128,23 @@ class AppConfig:
     # Agent behavior.
     agent_mode: str
     max_turns: int = 5
+    # Compact older tool turns once history exceeds this many items (0 disables).
+    max_context_items: int = 0
+    # Stream model responses and start tool calls as soon as they arrive.
+    stream_responses: bool = False
+    # Character budget for prompt + memory context sent to Gemini.
+    max_prompt_chars: int = 32000
+
+    # Explicit Gemini context cache TTL in seconds (0 disables).
+    context_cache_ttl: int = 0
+
+    # Local response cache for identical Gemini requests (TTL 0 disables).
+    response_cache_file: str = "data/response_cache.db"
+    response_cache_ttl: int = 0
+    response_cache_max_entries: int = 1000
+
+    # Always let the planner rewrite the executor answer (extra LLM call).
+    planner_finalize: bool = False
 
     @classmethod
     def from_env(cls) -> "AppConfig":
@@ -82,22 +154,47 @@ class AppConfig:
         - Keep secrets in .env / secret manager.
         - Do not commit .env.
 
-        This method also logs warnings for missing keys to reduce setup confusion.
+        The parsed config is cached per process and rebuilt only when one of
+        the env vars it reads changes, so CLI and API can both call this freely.
         """
+        global _cached_config
+        _load_dotenv_once()
+        # One pass over os.environ; parsing below reads only this snapshot.
+        env_get = os.environ.get
+        env = {name: value for name in _CONFIG_ENV_KEYS if (value := env_get(name)) is not None}
+        cached = _cached_config
+        if cached is not None and cached[0] == env:
+            return cached[1]
+        config = cls._build_from_env(env)
+        _cached_config = (env, config)
+        return config
+
+    @classmethod
+    def _build_from_env(cls, env: Mapping[str, str]) -> "AppConfig":
+        """Parse an env snapshot into a new config and log warnings for missing keys."""
+        get = env.get
         config = cls(
-            model=os.getenv("GEMINI_MODEL", "gemini-2.5-flash"),
-            weatherapi_base_url=os.getenv("WEATHERAPI_BASE_URL", "https://api.weatherapi.com/v1"),
-            weatherapi_key=os.getenv("WEATHERAPI_KEY", ""),
-            log_level=os.getenv("LOG_LEVEL", "INFO").upper(),
-            log_file=os.getenv("LOG_FILE", "logs/agent.log"),
-            memory_file=os.getenv("MEMORY_FILE", "data/memory.db"),
-            memory_max_entries=_read_int_env("MEMORY_MAX_ENTRIES", 10),
-            mailbox_file=os.getenv("MAILBOX_FILE", "data/mailbox.db"),
-            agent_mode=os.getenv("AGENT_MODE", "multi").lower(),
-            max_turns=_read_int_env("MAX_TURNS", 5),
+            model=get("GEMINI_MODEL", "gemini-2.5-flash"),
+            weatherapi_base_url=get("WEATHERAPI_BASE_URL", "https://api.weatherapi.com/v1"),
+            weatherapi_key=get("WEATHERAPI_KEY", ""),
+            log_level=get("LOG_LEVEL", "INFO").upper(),
+            log_file=get("LOG_FILE", "logs/agent.log"),
+            memory_file=get("MEMORY_FILE", "data/memory.db"),
+            memory_max_entries=_read_int_env(env, "MEMORY_MAX_ENTRIES", 10),
+            mailbox_file=get("MAILBOX_FILE", "data/mailbox.db"),
+            agent_mode=get("AGENT_MODE", "multi").lower(),
+            max_turns=_read_int_env(env, "MAX_TURNS", 5),
+            max_context_items=_read_int_env(env, "MAX_CONTEXT_ITEMS", 0),
+            stream_responses=_read_bool_env(env, "STREAM_RESPONSES", False),
+            max_prompt_chars=_read_int_env(env, "MAX_PROMPT_CHARS", 32000),
+            context_cache_ttl=_read_int_env(env, "CONTEXT_CACHE_TTL", 0),
+            response_cache_file=get("RESPONSE_CACHE_FILE", "data/response_cache.db"),
+            response_cache_ttl=_read_int_env(env, "RESPONSE_CACHE_TTL", 0),
+            response_cache_max_entries=_read_int_env(env, "RESPONSE_CACHE_MAX_ENTRIES", 1000),
+            planner_finalize=_read_bool_env(env, "PLANNER_FINALIZE", False),
         )
 
-        if not os.getenv("GOOGLE_API_KEY"):
+        if not get("GOOGLE_API_KEY"):
             LOGGER.warning("GOOGLE_API_KEY is not set. Gemini calls will fail.")
         if not config.weatherapi_key:
             LOGGER.warning("WEATHERAPI_KEY is not set. Weather tools will fail.")
@@ -12,31 +12,50 @@ Keeping this in one place avoids duplicate setup code in `main.py` and `api.py`
 and makes it easy to build custom runners for tests.
 """
 
+import functools
 import logging
-from collections.abc import Callable
-from pathlib import Path
+import os
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
 
-from agents.agent import GeminiToolAgent
-from agents.multi_agent import MultiAgentCoordinator
-from agents.router import RouterAgent, RouterCoordinator
 from core.config import AppConfig
-from stores.mailbox import MailboxStore
-from stores.memory import MemoryStore
-from tools import ForecastTool, ToolRegistry, WeatherTool
+
+if TYPE_CHECKING:
+    from agents.agent import GeminiToolAgent
+    from agents.multi_agent import MultiAgentCoordinator
+    from agents.router import RunnerProtocol
+    from stores.response_cache import ResponseCacheStore
+    from tools import ToolRegistry
 
 # Runner signature used by both CLI and API layers.
 # Example call: `response = runner("Weather in Tokyo")`.
 Runner = Callable[[str], str]
 
+# Async runner signature used by the API layer.
+# Example call: `response = await runner("Weather in Tokyo")`.
+AsyncRunner = Callable[[str], Awaitable[str]]
+
+# Set once logging is configured so repeated calls (CLI + API in one process) are no-ops.
+_logging_configured = False
+
 
 def configure_logging(config: AppConfig) -> None:
-    """Initialize file logging according to AppConfig."""
-    log_path = Path(config.log_file)
+    """Initialize file logging according to AppConfig.
+
+    Only the first call per process takes effect; `basicConfig` would ignore
+    later calls anyway, so they return before touching the filesystem.
+    """
+    global _logging_configured
+    if _logging_configured:
+        return
+
+    log_dir = os.path.dirname(config.log_file)
 
     # Ensure target folder exists (for defaults this is `logs/`).
     # Example: logs/agent.log -> create logs/ if missing.
-    if log_path.parent != Path("."):
-        log_path.parent.mkdir(parents=True, exist_ok=True)
+    # The isdir check skips the failing mkdir syscall on every run after the first.
+    if log_dir and not os.path.isdir(log_dir):
+        os.makedirs(log_dir, exist_ok=True)
 
     # `basicConfig` is enough for this learning project.
     # For larger systems consider structured JSON logging.
@@ -46,6 +65,7 @@ def configure_logging(config: AppConfig) -> None:
         filename=config.log_file,
         encoding="utf-8",
     )
+    _logging_configured = True
     logging.getLogger("agent.runtime").info(
         "Logging configured: file=%s level=%s",
         config.log_file,
@@ -68,23 +88,48 @@ def build_runner(config: AppConfig) -> tuple[Runner, str]:
         runner, mode = build_runner(config)
         text = runner("What's the weather in Tokyo?")
     """
+    coordinator, agent_mode = _build_coordinator(config)
+    return coordinator.run, agent_mode
+
+
+def build_async_runner(config: AppConfig) -> tuple[AsyncRunner, str]:
+    """Build async runner based on config.
+
+    Same wiring as `build_runner`, but returns the `arun` coroutine so the API
+    can serve concurrent requests without blocking worker threads on Gemini.
+
+    Example:
+        runner, mode = build_async_runner(config)
+        text = await runner("What's the weather in Tokyo?")
+    """
+    coordinator, agent_mode = _build_coordinator(config)
+    return coordinator.arun, agent_mode
+
+
+def _build_coordinator(config: AppConfig) -> tuple[RunnerProtocol, str]:
+    """Wire tools, stores and agents for the configured mode.
+
+    Agent and store modules are imported here, per mode, so importing this
+    module (CLI/API startup) does not pay for the google-genai SDK or for
+    the code of modes that are not used.
+    """
+    from stores.response_cache import ResponseCacheStore
+
     logger = logging.getLogger("agent.runtime")
     logger.info("Building runner for requested mode=%s", config.agent_mode)
 
-    # Register model tools once and reuse.
-    # Current tools: current weather + forecast.
-    tool_registry = ToolRegistry(
-        [
-            WeatherTool(api_key=config.weatherapi_key, base_url=config.weatherapi_base_url),
-            ForecastTool(api_key=config.weatherapi_key, base_url=config.weatherapi_base_url),
-        ]
-    )
-    logger.info("Tool registry initialized")
+    # Register model tools once per process and reuse across runners.
+    tool_registry = _make_tool_registry(config.weatherapi_key, config.weatherapi_base_url)
 
-    # Memory is used by single-agent mode to provide short chat history.
-    memory_store = MemoryStore(
-        path=config.memory_file,
-        max_entries=config.memory_max_entries,
+    # Optional response cache shared by all agents (disabled when TTL is 0).
+    response_cache = (
+        ResponseCacheStore(
+            path=config.response_cache_file,
+            ttl_seconds=config.response_cache_ttl,
+            max_entries=config.response_cache_max_entries,
+        )
+        if config.response_cache_ttl > 0
+        else None
     )
 
     agent_mode = _resolve_agent_mode(config.agent_mode)
@@ -92,56 +137,106 @@ def build_runner(config: AppConfig) -> tuple[Runner, str]:
         logger.warning("Unknown AGENT_MODE '%s'. Fallback to '%s'.", config.agent_mode, agent_mode)
 
     if agent_mode == "multi":
-        # Multi mode uses mailbox to track planner/executor message exchange.
-        # Planner has no tools; executor has the full tool registry.
-        mailbox = MailboxStore(path=config.mailbox_file)
-        coordinator = MultiAgentCoordinator(
-            model=config.model,
-            planner_registry=ToolRegistry([]),
-            executor_registry=tool_registry,
-            mailbox=mailbox,
-            max_turns=config.max_turns,
-        )
+        coordinator = _build_multi_agent(config, tool_registry, response_cache)
         logger.info("Runner created: multi-agent coordinator")
-        return coordinator.run, agent_mode
+        return coordinator, agent_mode
 
     if agent_mode == "router":
+        from agents.router import RouterAgent, RouterCoordinator
+
         # Router mode decides per-request whether to run single or multi flow.
         # Router has no tools; it only returns a route decision.
-        router = RouterAgent(model=config.model, max_turns=1)
-
-        # Direct path uses the same tool registry and memory as single mode.
-        direct_agent = GeminiToolAgent(
-            model=config.model,
-            tool_registry=tool_registry,
-            memory_store=memory_store,
-            max_turns=config.max_turns,
-        )
-
-        # Plan path uses the multi-agent coordinator with a mailbox trace.
-        mailbox = MailboxStore(path=config.mailbox_file)
-        plan_agent = MultiAgentCoordinator(
-            model=config.model,
-            planner_registry=ToolRegistry([]),
-            executor_registry=tool_registry,
-            mailbox=mailbox,
-            max_turns=config.max_turns,
-        )
-
+        # Direct path is the single-mode agent; plan path is the multi-mode coordinator.
         coordinator = RouterCoordinator(
-            router=router,
-            direct_agent=direct_agent,
-            plan_agent=plan_agent,
+            router=RouterAgent(model=config.model),
+            direct_agent=_build_single_agent(config, tool_registry, response_cache),
+            plan_agent=_build_multi_agent(config, tool_registry, response_cache),
+            tool_registry=tool_registry,
         )
         logger.info("Runner created: router coordinator")
-        return coordinator.run, agent_mode
+        return coordinator, agent_mode
 
     # Single mode: one agent handles prompt + tool calls directly.
-    agent = GeminiToolAgent(
+    agent = _build_single_agent(config, tool_registry, response_cache)
+    logger.info("Runner created: single agent")
+    return agent, agent_mode
+
+
+@functools.lru_cache(maxsize=1)
+def _make_tool_registry(api_key: str, base_url: str) -> ToolRegistry:
+    """Build the weather tool registry once per (api_key, base_url).
+
+    Runners built later in the same process (CLI + API, tests) share the
+    tool instances and their memoized Gemini declarations.
+    Current tools: current weather + forecast + multi-city current weather.
+    """
+    from tools import BatchWeatherTool, ForecastTool, ToolRegistry, WeatherClient, WeatherTool
+
+    # One client: all weather tools share its response cache.
+    client = WeatherClient(api_key=api_key, base_url=base_url)
+    weather_tool = WeatherTool(client)
+    registry = ToolRegistry(
+        [
+            weather_tool,
+            ForecastTool(client),
+            # Shares the single-city tool (and its response cache).
+            BatchWeatherTool(weather_tool),
+        ]
+    )
+    logging.getLogger("agent.runtime").info("Tool registry initialized")
+    return registry
+
+
+def _build_single_agent(
+    config: AppConfig,
+    tool_registry: ToolRegistry,
+    response_cache: ResponseCacheStore | None,
+) -> GeminiToolAgent:
+    """Build the tool-calling agent used by single mode and the router direct path."""
+    from agents.agent import GeminiToolAgent
+    from stores.memory import MemoryStore
+
+    # Memory provides short chat history to the single agent.
+    memory_store = MemoryStore(
+        path=config.memory_file,
+        max_entries=config.memory_max_entries,
+    )
+    return GeminiToolAgent(
         model=config.model,
         tool_registry=tool_registry,
         memory_store=memory_store,
         max_turns=config.max_turns,
+        context_cache_ttl=config.context_cache_ttl,
+        response_cache=response_cache,
+        max_context_items=config.max_context_items,
+        stream_responses=config.stream_responses,
+        max_prompt_chars=config.max_prompt_chars,
+    )
+
+
+def _build_multi_agent(
+    config: AppConfig,
+    tool_registry: ToolRegistry,
+    response_cache: ResponseCacheStore | None,
+) -> MultiAgentCoordinator:
+    """Build the planner/executor coordinator used by multi mode and the router plan path."""
+    from agents.multi_agent import MultiAgentCoordinator
+    from stores.mailbox import MailboxStore
+    from tools import ToolRegistry
+
+    # Mailbox tracks planner/executor message exchange.
+    # Planner has no tools; executor has the full tool registry.
+    mailbox = MailboxStore(path=config.mailbox_file)
+    return MultiAgentCoordinator(
+        model=config.model,
+        planner_registry=ToolRegistry([]),
+        executor_registry=tool_registry,
+        mailbox=mailbox,
+        max_turns=config.max_turns,
+        context_cache_ttl=config.context_cache_ttl,
+        response_cache=response_cache,
+        planner_finalize=config.planner_finalize,
+        max_context_items=config.max_context_items,
+        stream_responses=config.stream_responses,
+        max_prompt_chars=config.max_prompt_chars,
     )
-    logger.info("Runner created: single agent")
-    return agent.run, agent_mode
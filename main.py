@@ -32,9 +32,8 @@ def main() -> None:
     logger.info("CLI started with mode=%s", resolved_mode)
 
     # 4) Read prompt from CLI args; fallback to a safe default.
-    if len(sys.argv) > 1:
-        prompt = " ".join(sys.argv[1:])
-    else:
+    prompt = " ".join(sys.argv[1:]).strip()
+    if not prompt:
         # Default demo prompt keeps a no-arg run useful.
         prompt = "What is the weather like in Boston right now?"
 
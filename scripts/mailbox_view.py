@@ -8,11 +8,12 @@ Usage:
 """
 
 import argparse
-import json
 import os
 import sqlite3
 from pathlib import Path
 
+import orjson
+
 
 def _connect(path: str) -> sqlite3.Connection:
     conn = sqlite3.connect(path)
@@ -65,9 +66,8 @@ def show_thread(conn: sqlite3.Connection, thread_id: str) -> None:
     print(f"Thread {thread_id}:")
     for row in rows:
         try:
-            content = json.loads(row["content"])
-            content_text = json.dumps(content, ensure_ascii=False)
-        except json.JSONDecodeError:
+            content_text = orjson.dumps(orjson.loads(row["content"])).decode("utf-8")
+        except orjson.JSONDecodeError:
             content_text = row["content"]
 
         print(f"[{row['timestamp']}] {row['sender']} -> {row['recipient']}")
@@ -1,4 +1,5 @@
 from .mailbox import MailboxStore
 from .memory import MemoryStore
+from .response_cache import ResponseCacheStore
 
-__all__ = ["MailboxStore", "MemoryStore"]
+__all__ = ["MailboxStore", "MemoryStore", "ResponseCacheStore"]
@@ -2,7 +2,9 @@
 
 """SQLite-backed mailbox for multi-agent message trace.
 
-Every send() appends one message and persists it to disk.
+Every send() appends one message to an in-memory queue; flush() writes the
+queue to disk in a single transaction (the coordinator flushes at the end of
+each run, and pending messages are also flushed at exit).
 This makes debugging multi-agent flows transparent because you can
 query the full planner/executor conversation via SQL or a helper script.
 
@@ -11,15 +13,31 @@ Notes:
   delete or rename them before running to avoid "not a database" errors.
 """
 
-import json
+import atexit
 import logging
 import sqlite3
-from dataclasses import asdict, dataclass
+import weakref
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
+from threading import Lock
 
+import orjson
 
-@dataclass(frozen=True)
+from stores.connection import open_connection
+
+# Live stores, flushed by one exit hook. Weak refs so the hook does not keep
+# discarded stores (tests, rebuilt coordinators) alive.
+_live_stores: weakref.WeakSet[MailboxStore] = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_stores() -> None:
+    for store in list(_live_stores):
+        store.flush()
+
+
+@dataclass(frozen=True, slots=True)
 class MailboxMessage:
     sender: str
     recipient: str
@@ -31,26 +49,42 @@ class MailboxMessage:
 class MailboxStore:
     """Persistent mailbox used by planner/executor/user roles."""
 
-    def __init__(self, path: str) -> None:
+    def __init__(self, path: str, max_pending: int = 64) -> None:
         self._path = Path(path)
+        # Queue size that forces a flush from send(), bounding unflushed rows
+        # when runs fail before their end-of-run flush.
+        self._max_pending = max(1, max_pending)
+        # Serializes use of the long-lived connection (see stores/connection.py).
+        self._lock = Lock()
+        self._conn: sqlite3.Connection | None = None
+        # Rows waiting for the next flush(); guarded by _lock.
+        self._pending: list[tuple[str, str, str, str, str]] = []
         self._logger = logging.getLogger("agent.mailbox")
-        self._init_db()
+        # The connection (and schema) is created on first access so unused stores cost no file I/O.
+        _live_stores.add(self)
         self._logger.info("MailboxStore initialized: path=%s", self._path)
 
-    def _connect(self) -> sqlite3.Connection:
-        """Open a new SQLite connection for a single operation."""
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(self._path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _connection(self) -> sqlite3.Connection:
+        """Return the store connection, opening it on first use.
 
-    def _init_db(self) -> None:
+        Callers must hold `self._lock`.
+        """
+        if self._conn is None:
+            conn = open_connection(self._path)
+            self._init_db(conn)
+            self._conn = conn
+        return self._conn
+
+    def _init_db(self, conn: sqlite3.Connection) -> None:
         """Ensure the mailbox table exists."""
-        with self._connect() as conn:
+        with conn:
+            # Plain INTEGER PRIMARY KEY (rowid alias): ids stay increasing because the
+            # newest row is never deleted, and inserts skip the sqlite_sequence update
+            # that AUTOINCREMENT would add.
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS mailbox_messages (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id INTEGER PRIMARY KEY,
                     sender TEXT NOT NULL,
                     recipient TEXT NOT NULL,
                     content TEXT NOT NULL,
@@ -64,42 +98,56 @@ class MailboxStore:
             )
 
     def send(self, sender: str, recipient: str, content: dict[str, str], thread_id: str) -> None:
-        """Append one message to mailbox.
+        """Queue one message for the mailbox; it is persisted on the next flush().
 
         Example:
             send("planner", "executor", {"plan": "1) ..."}, thread_id)
         """
+        # orjson keeps non-ASCII text as is (like ensure_ascii=False).
+        payload = orjson.dumps(content).decode("utf-8")
+        # The queued tuple is the INSERT row itself; no MailboxMessage is built on send.
         # Timestamps are stored in UTC to keep ordering consistent.
-        message = MailboxMessage(
-            sender=sender,
-            recipient=recipient,
-            content=content,
-            thread_id=thread_id,
-            timestamp=datetime.now(timezone.utc).isoformat(),
-        )
-        payload = json.dumps(message.content, ensure_ascii=False)
-
-        with self._connect() as conn:
-            conn.execute(
-                """
-                INSERT INTO mailbox_messages (sender, recipient, content, thread_id, timestamp)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (message.sender, message.recipient, payload, message.thread_id, message.timestamp),
+        row = (sender, recipient, payload, thread_id, datetime.now(timezone.utc).isoformat())
+
+        with self._lock:
+            self._pending.append(row)
+            flush_now = len(self._pending) >= self._max_pending
+        if flush_now:
+            self.flush()
+
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info(
+                "Mailbox message queued: thread=%s sender=%s recipient=%s content_keys=%s",
+                thread_id,
+                sender,
+                recipient,
+                list(content.keys()),
             )
 
-        self._logger.info(
-            "Mailbox message saved: thread=%s sender=%s recipient=%s content_keys=%s",
-            thread_id,
-            sender,
-            recipient,
-            list(content.keys()),
-        )
+    def flush(self) -> None:
+        """Write all queued messages in one transaction."""
+        with self._lock:
+            if not self._pending:
+                return
+            rows = self._pending
+            with self._connection() as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO mailbox_messages (sender, recipient, content, thread_id, timestamp)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    rows,
+                )
+            # Cleared only after commit: on errors (e.g. "database is locked") the
+            # rows stay queued for the next flush.
+            self._pending = []
+        self._logger.debug("Mailbox flushed: %s messages", len(rows))
 
     def thread_messages(self, thread_id: str) -> list[MailboxMessage]:
         """Return all messages for one conversation thread."""
-        with self._connect() as conn:
-            rows = conn.execute(
+        self.flush()
+        with self._lock:
+            rows = self._connection().execute(
                 """
                 SELECT sender, recipient, content, thread_id, timestamp
                 FROM mailbox_messages
@@ -112,8 +160,8 @@ class MailboxStore:
         messages: list[MailboxMessage] = []
         for row in rows:
             try:
-                content = json.loads(row["content"])
-            except json.JSONDecodeError:
+                content = orjson.loads(row["content"])
+            except orjson.JSONDecodeError:
                 content = {"raw": row["content"]}
             messages.append(
                 MailboxMessage(
@@ -0,0 +1,107 @@
+﻿from __future__ import annotations
+
+"""SQLite-backed cache for Gemini responses.
+
+Purpose:
+1) Skip repeated model calls for identical requests (retries, dev/test loops).
+2) Expire entries after a TTL and keep only the most recently used N entries.
+
+Notes:
+- Keys are opaque hashes computed by the agent from model, contents and tools.
+- Values are serialized responses (JSON text); the store does not parse them.
+"""
+
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from threading import Lock
+
+from stores.connection import open_connection
+
+
+class ResponseCacheStore:
+    """Persistent TTL + LRU cache of serialized model responses."""
+
+    def __init__(self, path: str, ttl_seconds: int = 3600, max_entries: int = 1000) -> None:
+        self._path = Path(path)
+        self._ttl_seconds = max(1, ttl_seconds)
+        self._max_entries = max(1, max_entries)
+        # Serializes use of the long-lived connection (see stores/connection.py).
+        self._lock = Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._logger = logging.getLogger("agent.response_cache")
+        with self._lock:
+            self._connection()
+        self._logger.info(
+            "ResponseCacheStore initialized: path=%s ttl=%ss max_entries=%s",
+            self._path,
+            self._ttl_seconds,
+            self._max_entries,
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the store connection, opening it on first use.
+
+        Callers must hold `self._lock`.
+        """
+        if self._conn is None:
+            conn = open_connection(self._path)
+            self._init_db(conn)
+            self._conn = conn
+        return self._conn
+
+    def _init_db(self, conn: sqlite3.Connection) -> None:
+        """Ensure the cache table exists."""
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_response_cache_access ON response_cache(last_access)"
+            )
+
+    def get(self, key: str) -> str | None:
+        """Return cached value for key, or None if missing/expired."""
+        now = time.time()
+        with self._lock, self._connection() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM response_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if row["expires_at"] <= now:
+                conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE response_cache SET last_access = ? WHERE key = ?", (now, key))
+        return row["value"]
+
+    def set(self, key: str, value: str) -> None:
+        """Store value for key and evict least recently used entries beyond N."""
+        now = time.time()
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO response_cache (key, value, expires_at, last_access)
+                VALUES (?, ?, ?, ?)
+                """,
+                (key, value, now + self._ttl_seconds, now),
+            )
+            conn.execute(
+                """
+                DELETE FROM response_cache
+                WHERE key NOT IN (
+                    SELECT key FROM response_cache ORDER BY last_access DESC LIMIT ?
+                )
+                """,
+                (self._max_entries,),
+            )
+        self._logger.debug("Response cached: key=%s chars=%s", key[:12], len(value))
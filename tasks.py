@@ -4,11 +4,21 @@ This keeps usage consistent across machines without requiring Make/Just.
 """
 
 import argparse
+import os
 import subprocess
 import sys
 
 
 def _run(command: list[str]) -> None:
+    """Run the task command as the final step of this script.
+
+    On POSIX the process is replaced via exec, so no idle parent interpreter
+    stays alive and the task's exit code is returned directly. Windows has no
+    real exec (os.execv spawns and exits), so it keeps a child process.
+    """
+    if os.name == "posix":
+        sys.stdout.flush()
+        os.execvp(command[0], command)
     subprocess.run(command, check=True)
 
 
@@ -0,0 +1,387 @@
+﻿"""Agent loop tests.
+
+These tests inject a fake Gemini client so no external API calls are made.
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from google.genai import types
+
+from agents.agent import GeminiToolAgent
+from stores.memory import MemoryStore
+from stores.response_cache import ResponseCacheStore
+from tools.registry import ToolRegistry
+
+
+class FakeModels:
+    def __init__(self, responses: list[Any]) -> None:
+        self._responses = list(responses)
+        self.calls: list[dict[str, Any]] = []
+
+    def generate_content(self, **kwargs: Any) -> Any:
+        self.calls.append(kwargs)
+        return self._responses.pop(0)
+
+    def generate_content_stream(self, **kwargs: Any) -> Any:
+        # Each queued item is a list of chunks for one streamed turn.
+        self.calls.append(kwargs)
+        return iter(self._responses.pop(0))
+
+
+class FakeAsyncModels(FakeModels):
+    async def generate_content(self, **kwargs: Any) -> Any:
+        return super().generate_content(**kwargs)
+
+    async def generate_content_stream(self, **kwargs: Any) -> Any:
+        chunks = super().generate_content_stream(**kwargs)
+
+        async def iterate() -> Any:
+            # Yield to the loop between chunks like a network stream; an
+            # exception queued among the chunks is raised mid-stream.
+            for chunk in chunks:
+                await asyncio.sleep(0)
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+
+        return iterate()
+
+
+class FakeCaches:
+    def __init__(self) -> None:
+        self.created: list[dict[str, Any]] = []
+
+    def create(self, **kwargs: Any) -> Any:
+        self.created.append(kwargs)
+        return SimpleNamespace(name="cachedContents/test")
+
+
+class FakeClient:
+    def __init__(self, responses: list[Any]) -> None:
+        self.models = FakeModels(responses)
+        self.aio = SimpleNamespace(models=FakeAsyncModels(responses))
+        self.caches = FakeCaches()
+
+
+class EchoTool:
+    """Tool that waits on a barrier so the test fails if calls run sequentially."""
+
+    def __init__(self, name: str, barrier: threading.Barrier) -> None:
+        self.name = name
+        self._barrier = barrier
+
+    def declaration(self) -> Any:
+        return types.FunctionDeclaration(name=self.name, description="echo")
+
+    def output_schema(self) -> dict[str, Any]:
+        return {}
+
+    def execute(self, **kwargs: Any) -> dict[str, Any]:
+        self._barrier.wait(timeout=5)
+        return {"tool": self.name, **kwargs}
+
+
+def _call(name: str, **args: Any) -> Any:
+    return SimpleNamespace(name=name, args=args)
+
+
+def _response(text: str = "", function_calls: list[Any] | None = None) -> Any:
+    return SimpleNamespace(text=text, function_calls=function_calls or [], candidates=[])
+
+
+def test_parallel_tool_calls_keep_order() -> None:
+    barrier = threading.Barrier(2)
+    registry = ToolRegistry([EchoTool("first", barrier), EchoTool("second", barrier)])
+    agent = GeminiToolAgent(model="test-model", tool_registry=registry)
+    client = FakeClient(
+        [
+            _response(function_calls=[_call("first", x=1), _call("second", x=2)]),
+            _response(text="done"),
+        ]
+    )
+    agent._client = client
+
+    assert agent.run("hi") == "done"
+
+    tool_turn = client.models.calls[1]["contents"][-1]
+    names = [part.function_response.name for part in tool_turn.parts]
+    assert names == ["first", "second"]
+    assert tool_turn.parts[1].function_response.response == {"result": {"tool": "second", "x": 2}}
+
+
+def test_nameless_call_does_not_break_later_calls() -> None:
+    registry = ToolRegistry([EchoTool("first", threading.Barrier(1))])
+    agent = GeminiToolAgent(model="test-model", tool_registry=registry)
+    client = FakeClient(
+        [
+            _response(function_calls=[types.FunctionCall(name=None, args={})]),
+            _response(function_calls=[types.FunctionCall(name="first", args={"x": 1})]),
+            _response(text="done"),
+        ]
+    )
+    agent._client = client
+
+    assert agent.run("hi") == "done"
+
+    contents = client.models.calls[2]["contents"]
+    assert contents[-3].parts[0].function_response.name == "unknown"
+    assert contents[-1].parts[0].function_response.response == {"result": {"tool": "first", "x": 1}}
+
+
+def test_arun_gathers_tool_calls() -> None:
+    barrier = threading.Barrier(2)
+    registry = ToolRegistry([EchoTool("first", barrier), EchoTool("second", barrier)])
+    agent = GeminiToolAgent(model="test-model", tool_registry=registry)
+    client = FakeClient(
+        [
+            _response(function_calls=[_call("first"), _call("second")]),
+            _response(text="async done"),
+        ]
+    )
+    agent._client = client
+
+    assert asyncio.run(agent.arun("hi")) == "async done"
+
+    tool_turn = client.aio.models.calls[1]["contents"][-1]
+    assert [part.function_response.name for part in tool_turn.parts] == ["first", "second"]
+
+
+def test_context_cache_used_for_large_prefix() -> None:
+    agent = GeminiToolAgent(
+        model="test-model",
+        tool_registry=ToolRegistry([]),
+        system_prompt="x" * 10000,
+        context_cache_ttl=600,
+    )
+    client = FakeClient([_response(text="a"), _response(text="b")])
+    agent._client = client
+
+    agent.run("one")
+    agent.run("two")
+
+    assert len(client.caches.created) == 1
+    config = client.models.calls[1]["config"]
+    assert config.cached_content == "cachedContents/test"
+    assert config.tools is None
+
+
+def test_context_cache_skipped_for_small_prefix() -> None:
+    agent = GeminiToolAgent(
+        model="test-model",
+        tool_registry=ToolRegistry([]),
+        system_prompt="short",
+        context_cache_ttl=600,
+    )
+    client = FakeClient([_response(text="a")])
+    agent._client = client
+
+    agent.run("one")
+
+    assert client.caches.created == []
+    assert client.models.calls[0]["config"].cached_content is None
+
+
+def test_response_cache_reuses_identical_request(tmp_path: Any) -> None:
+    cache = ResponseCacheStore(path=str(tmp_path / "cache.db"), ttl_seconds=60)
+    agent = GeminiToolAgent(model="test-model", tool_registry=ToolRegistry([]), response_cache=cache)
+    real_response = types.GenerateContentResponse(
+        candidates=[
+            types.Candidate(content=types.Content(role="model", parts=[types.Part.from_text(text="cached")]))
+        ]
+    )
+    client = FakeClient([real_response])
+    agent._client = client
+
+    assert agent.run("same prompt") == "cached"
+    assert agent.run("same prompt") == "cached"
+    assert len(client.models.calls) == 1
+
+
+def test_response_cache_skips_default_temperature(tmp_path: Any) -> None:
+    cache = ResponseCacheStore(path=str(tmp_path / "cache.db"), ttl_seconds=60)
+    agent = GeminiToolAgent(model="test-model", tool_registry=ToolRegistry([]), response_cache=cache)
+    contents = agent._build_contents("same prompt")
+
+    assert agent._base_config.temperature == 0
+    assert agent._response_cache_key(contents, agent._base_config) is not None
+    assert agent._response_cache_key(contents, types.GenerateContentConfig()) is None
+    assert agent._response_cache_key(contents, types.GenerateContentConfig(temperature=0.7)) is None
+
+    # A request sent with the model's default temperature is not replayed.
+    agent._base_config = types.GenerateContentConfig()
+    client = FakeClient([_response(text="one"), _response(text="two")])
+    agent._client = client
+    assert agent.run("same prompt") == "one"
+    assert agent.run("same prompt") == "two"
+
+
+def test_compact_contents_keeps_recent_pairs() -> None:
+    barrier = threading.Barrier(1)
+    registry = ToolRegistry([EchoTool("first", barrier)])
+    agent = GeminiToolAgent(model="test-model", tool_registry=registry, max_turns=5, max_context_items=4)
+    client = FakeClient(
+        [
+            _response(function_calls=[_call("first", turn=1)]),
+            _response(function_calls=[_call("first", turn=2)]),
+            _response(function_calls=[_call("first", turn=3)]),
+            _response(text="done"),
+        ]
+    )
+    agent._client = client
+
+    assert agent.run("hi") == "done"
+
+    contents = client.models.calls[-1]["contents"]
+    assert len(contents) == 4
+    digest = contents[1].parts[0].text
+    assert digest.startswith("Earlier tool results")
+    assert '"turn":1' in digest and '"turn":2' in digest
+    assert contents[3].parts[0].function_response.response == {"result": {"tool": "first", "turn": 3}}
+
+
+def _chunk(part: types.Part) -> Any:
+    return types.GenerateContentResponse(candidates=[types.Candidate(content=types.Content(role="model", parts=[part]))])
+
+
+def test_streaming_runs_tools_from_streamed_calls() -> None:
+    barrier = threading.Barrier(2)
+    registry = ToolRegistry([EchoTool("first", barrier), EchoTool("second", barrier)])
+    agent = GeminiToolAgent(model="test-model", tool_registry=registry, stream_responses=True)
+    client = FakeClient(
+        [
+            [
+                _chunk(types.Part.from_function_call(name="first", args={"x": 1})),
+                _chunk(types.Part.from_function_call(name="second", args={"x": 2})),
+            ],
+            [_chunk(types.Part(text="str")), _chunk(types.Part(text="eamed"))],
+        ]
+    )
+    agent._client = client
+
+    assert agent.run("hi") == "streamed"
+
+    tool_turn = client.models.calls[1]["contents"][-1]
+    assert [part.function_response.name for part in tool_turn.parts] == ["first", "second"]
+
+
+def test_arun_streaming_runs_tools_from_streamed_calls() -> None:
+    barrier = threading.Barrier(2)
+    registry = ToolRegistry([EchoTool("first", barrier), EchoTool("second", barrier)])
+    agent = GeminiToolAgent(model="test-model", tool_registry=registry, stream_responses=True)
+    client = FakeClient(
+        [
+            [
+                _chunk(types.Part.from_function_call(name="first", args={"x": 1})),
+                _chunk(types.Part.from_function_call(name="second", args={"x": 2})),
+            ],
+            [_chunk(types.Part(text="async ")), _chunk(types.Part(text="streamed"))],
+        ]
+    )
+    agent._client = client
+
+    assert asyncio.run(agent.arun("hi")) == "async streamed"
+
+    tool_turn = client.aio.models.calls[1]["contents"][-1]
+    assert [part.function_response.name for part in tool_turn.parts] == ["first", "second"]
+    assert tool_turn.parts[1].function_response.response == {"result": {"tool": "second", "x": 2}}
+
+
+def test_arun_streaming_error_cancels_started_tools() -> None:
+    cancelled: list[str] = []
+
+    class BlockingTool:
+        name = "slow"
+
+        def declaration(self) -> Any:
+            return types.FunctionDeclaration(name=self.name, description="blocks until cancelled")
+
+        def output_schema(self) -> dict[str, Any]:
+            return {}
+
+        def execute(self, **kwargs: Any) -> dict[str, Any]:
+            raise AssertionError("async path expected")
+
+        async def aexecute(self, **kwargs: Any) -> dict[str, Any]:
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(self.name)
+                raise
+            return {}
+
+    agent = GeminiToolAgent(model="test-model", tool_registry=ToolRegistry([BlockingTool()]), stream_responses=True)
+    agent._client = FakeClient(
+        [[_chunk(types.Part.from_function_call(name="slow", args={})), RuntimeError("stream dropped")]]
+    )
+
+    async def run() -> None:
+        with pytest.raises(RuntimeError, match="stream dropped"):
+            await agent.arun("hi")
+        # Nothing started by the failed turn is still pending.
+        assert [task for task in asyncio.all_tasks() if task is not asyncio.current_task()] == []
+
+    asyncio.run(run())
+    assert cancelled == ["slow"]
+
+
+def test_arun_keeps_store_io_off_the_event_loop(tmp_path: Any) -> None:
+    store_threads: list[int] = []
+
+    class RecordingMemory(MemoryStore):
+        def format_for_prompt(self) -> str:
+            store_threads.append(threading.get_ident())
+            return super().format_for_prompt()
+
+        def add_interaction(self, prompt: str, response: str) -> None:
+            store_threads.append(threading.get_ident())
+            super().add_interaction(prompt, response)
+
+    class RecordingCache(ResponseCacheStore):
+        def get(self, key: str) -> str | None:
+            store_threads.append(threading.get_ident())
+            return super().get(key)
+
+        def set(self, key: str, value: str) -> None:
+            store_threads.append(threading.get_ident())
+            super().set(key, value)
+
+    agent = GeminiToolAgent(
+        model="test-model",
+        tool_registry=ToolRegistry([]),
+        memory_store=RecordingMemory(path=str(tmp_path / "memory.db")),
+        response_cache=RecordingCache(path=str(tmp_path / "cache.db")),
+    )
+    agent._client = FakeClient(
+        [types.GenerateContentResponse(candidates=[types.Candidate(content=types.Content(role="model", parts=[]))])]
+    )
+
+    async def run() -> int:
+        await agent.arun("hi")
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+
+    assert len(store_threads) == 4
+    assert loop_thread not in store_threads
+
+
+def test_memory_trimmed_to_prompt_budget() -> None:
+    agent = GeminiToolAgent(model="test-model", tool_registry=ToolRegistry([]), max_prompt_chars=80)
+    memory = "User: old question\nAssistant: old answer\nUser: new question\nAssistant: new answer"
+
+    trimmed = agent._fit_memory(memory, 80 - len("hi"))
+
+    assert trimmed == "User: new question\nAssistant: new answer"
+
+
+def test_oversized_prompt_rejected_without_model_call() -> None:
+    agent = GeminiToolAgent(model="test-model", tool_registry=ToolRegistry([]), max_prompt_chars=10)
+    client = FakeClient([])
+    agent._client = client
+
+    assert agent.run("x" * 11).startswith("Prompt is too long")
+    assert client.models.calls == []
@@ -1,36 +1,54 @@
 ﻿"""API smoke tests.
 
 These tests inject a fake runner so no external API calls are made.
+The sync-runner app and its client are built once per module; entering the
+client context starts one event-loop portal shared by all requests.
 """
 
+from collections.abc import Iterator
+
+import pytest
 from fastapi.testclient import TestClient
 
 from api import create_app
 
 
-def test_health() -> None:
-    app = create_app(runner=lambda prompt: "ok", agent_mode="single", model="test-model")
-    client = TestClient(app)
+@pytest.fixture(scope="module")
+def client() -> Iterator[TestClient]:
+    def fake_runner(prompt: str) -> str:
+        return f"echo:{prompt}"
+
+    app = create_app(runner=fake_runner, agent_mode="multi", model="test-model")
+    with TestClient(app) as test_client:
+        yield test_client
 
+
+def test_health(client: TestClient) -> None:
     response = client.get("/health")
     assert response.status_code == 200
     data = response.json()
 
     assert data["status"] == "ok"
-    assert data["mode"] == "single"
+    assert data["mode"] == "multi"
     assert data["model"] == "test-model"
 
 
-def test_chat() -> None:
-    def fake_runner(prompt: str) -> str:
-        return f"echo:{prompt}"
-
-    app = create_app(runner=fake_runner, agent_mode="multi", model="test-model")
-    client = TestClient(app)
-
+def test_chat(client: TestClient) -> None:
     response = client.post("/chat", json={"prompt": "hi"})
     assert response.status_code == 200
     data = response.json()
 
     assert data["response"] == "echo:hi"
     assert data["mode"] == "multi"
+
+
+def test_chat_async_runner() -> None:
+    async def fake_runner(prompt: str) -> str:
+        return f"async:{prompt}"
+
+    app = create_app(runner=fake_runner, agent_mode="router", model="test-model")
+    with TestClient(app) as client:
+        response = client.post("/chat", json={"prompt": "hi"})
+
+    assert response.status_code == 200
+    assert response.json()["response"] == "async:hi"
@@ -0,0 +1,33 @@
+﻿"""Memory store tests.
+
+These tests use a temporary SQLite file and do not require external API calls.
+"""
+
+from typing import Any
+
+from stores.memory import MemoryStore
+
+
+def test_format_for_prompt_keeps_last_entries_in_order(tmp_path: Any) -> None:
+    store = MemoryStore(path=str(tmp_path / "memory.db"), max_entries=2)
+    for index in range(3):
+        store.add_interaction(f"q{index}", f"a{index}")
+
+    assert store.format_for_prompt() == "User: q1\nAssistant: a1\nUser: q2\nAssistant: a2"
+
+
+def test_format_for_prompt_cache_invalidated_on_add(tmp_path: Any) -> None:
+    store = MemoryStore(path=str(tmp_path / "memory.db"))
+    assert store.format_for_prompt() == ""
+
+    store.add_interaction("weather?", "sunny")
+
+    assert store.format_for_prompt() == "User: weather?\nAssistant: sunny"
+
+
+def test_duplicate_interaction_not_stored_twice(tmp_path: Any) -> None:
+    store = MemoryStore(path=str(tmp_path / "memory.db"))
+    store.add_interaction("weather?", "sunny")
+    store.add_interaction("weather?", "sunny")
+
+    assert store.format_for_prompt() == "User: weather?\nAssistant: sunny"
@@ -0,0 +1,110 @@
+﻿"""Multi-agent coordinator tests.
+
+These tests replace planner/executor agents with fakes so no external API calls are made.
+"""
+
+import gc
+import sqlite3
+import weakref
+from typing import Any
+
+import pytest
+
+import stores.mailbox as mailbox_module
+from agents.agent import GeminiToolAgent
+from agents.multi_agent import MultiAgentCoordinator
+from stores.mailbox import MailboxStore
+from tools.registry import ToolRegistry
+
+
+class FakeAgent:
+    def __init__(self, replies: list[str]) -> None:
+        self._replies = list(replies)
+        self.prompts: list[str] = []
+
+    def run(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return self._replies.pop(0)
+
+
+def _coordinator(tmp_path: Any, planner: FakeAgent, executor: FakeAgent, **kwargs: Any) -> MultiAgentCoordinator:
+    coordinator = MultiAgentCoordinator(
+        model="test-model",
+        planner_registry=ToolRegistry([]),
+        executor_registry=ToolRegistry([]),
+        mailbox=MailboxStore(path=str(tmp_path / "mailbox.db")),
+        **kwargs,
+    )
+    coordinator._planner = planner
+    coordinator._executor = executor
+    return coordinator
+
+
+def test_executor_answer_skips_planner_finalize(tmp_path: Any) -> None:
+    planner = FakeAgent(["1. check weather"])
+    executor = FakeAgent(["It is sunny."])
+
+    assert _coordinator(tmp_path, planner, executor).run("weather?") == "It is sunny."
+    assert len(planner.prompts) == 1
+
+
+def test_max_turns_result_goes_back_to_planner(tmp_path: Any) -> None:
+    planner = FakeAgent(["1. check weather", "Sorry, no data."])
+    executor = FakeAgent([GeminiToolAgent.MAX_TURNS_MESSAGE])
+
+    assert _coordinator(tmp_path, planner, executor).run("weather?") == "Sorry, no data."
+    assert len(planner.prompts) == 2
+
+
+def test_mailbox_trace_flushed_at_end_of_run(tmp_path: Any) -> None:
+    coordinator = _coordinator(tmp_path, FakeAgent(["1. check weather"]), FakeAgent(["It is sunny."]))
+    coordinator.run("weather?")
+
+    reader = MailboxStore(path=str(tmp_path / "mailbox.db"))
+    rows = reader._connection().execute("SELECT sender, recipient FROM mailbox_messages ORDER BY id").fetchall()
+
+    assert [(row["sender"], row["recipient"]) for row in rows] == [
+        ("user", "planner"),
+        ("planner", "executor"),
+        ("executor", "user"),
+    ]
+
+
+def test_mailbox_flushes_when_queue_is_full(tmp_path: Any) -> None:
+    mailbox = MailboxStore(path=str(tmp_path / "mailbox.db"), max_pending=2)
+    mailbox.send("user", "planner", {"prompt": "a"}, "t1")
+    assert len(mailbox._pending) == 1
+
+    mailbox.send("user", "planner", {"prompt": "b"}, "t1")
+
+    assert mailbox._pending == []
+    assert len(mailbox.thread_messages("t1")) == 2
+
+
+def test_exit_flush_hook_does_not_pin_stores(tmp_path: Any) -> None:
+    mailbox = MailboxStore(path=str(tmp_path / "mailbox.db"))
+    mailbox.send("user", "planner", {"prompt": "a"}, "t1")
+    mailbox_module._flush_live_stores()
+    assert mailbox._pending == []
+
+    ref = weakref.ref(mailbox)
+    del mailbox
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_failed_flush_keeps_queued_messages(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    mailbox = MailboxStore(path=str(tmp_path / "mailbox.db"))
+    mailbox.send("user", "planner", {"prompt": "a"}, "t1")
+
+    def locked() -> sqlite3.Connection:
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(mailbox, "_connection", locked)
+    with pytest.raises(sqlite3.OperationalError):
+        mailbox.flush()
+    assert len(mailbox._pending) == 1
+
+    monkeypatch.undo()
+    assert len(mailbox.thread_messages("t1")) == 1
@@ -3,7 +3,27 @@
 These tests do not require external API calls.
 """
 
-from agents.router import parse_router_response
+from types import SimpleNamespace
+from typing import Any
+
+from agents.router import RouteDecisionModel, RouterAgent, parse_router_response, quick_route
+
+
+class FakeModels:
+    def __init__(self, response: Any) -> None:
+        self._response = response
+        self.calls: list[dict[str, Any]] = []
+
+    def generate_content(self, **kwargs: Any) -> Any:
+        self.calls.append(kwargs)
+        return self._response
+
+
+def _router_with_response(response: Any) -> tuple[RouterAgent, FakeModels]:
+    router = RouterAgent(model="test-model")
+    models = FakeModels(response)
+    router._client = SimpleNamespace(models=models)
+    return router, models
 
 
 def test_parse_router_json_direct() -> None:
@@ -28,3 +48,55 @@ def test_parse_router_fallback_keyword() -> None:
 def test_parse_router_failure_returns_none() -> None:
     decision = parse_router_response("no keywords here")
     assert decision is None
+
+
+def test_parse_router_fallback_direct_wins() -> None:
+    decision = parse_router_response("No plan needed, go DIRECT.")
+    assert decision is not None
+    assert decision.route == "direct"
+
+
+def test_router_uses_parsed_schema_output() -> None:
+    parsed = RouteDecisionModel(route="direct", reason="greeting")
+    router, models = _router_with_response(SimpleNamespace(text="{}", parsed=parsed))
+
+    decision = router.decide("hi")
+    assert decision.route == "direct"
+    assert decision.reason == "greeting"
+    assert models.calls[0]["config"].response_schema is RouteDecisionModel
+
+
+def test_router_unparseable_output_falls_back_to_plan() -> None:
+    router, _ = _router_with_response(SimpleNamespace(text="???", parsed=None))
+
+    assert router.decide("hi").route == "plan"
+
+
+def test_router_caches_decision_for_normalized_prompt() -> None:
+    parsed = RouteDecisionModel(route="plan", reason="weather")
+    router, models = _router_with_response(SimpleNamespace(text="{}", parsed=parsed))
+
+    router.decide("Weather in Tokyo?")
+    decision = router.decide("  weather in   tokyo?")
+    assert decision.route == "plan"
+    assert len(models.calls) == 1
+
+
+def test_quick_route_heuristics() -> None:
+    keywords = frozenset({"weather", "forecast"})
+
+    weather = quick_route("What's the weather in Tokyo?", keywords)
+    assert weather is not None and weather.route == "plan"
+
+    greeting = quick_route("hi there", keywords)
+    assert greeting is not None and greeting.route == "direct"
+
+    assert quick_route("Summarize this and then translate it to French", keywords) is None
+
+
+def test_quick_route_defers_non_ascii_prompts() -> None:
+    keywords = frozenset({"weather", "forecast"})
+
+    assert quick_route("Какая погода в Токио, а потом сравни с прогнозом на завтра", keywords) is None
+    assert quick_route("東京の天気を調べてから明日の予報と比べて", keywords) is None
+    assert quick_route("???", keywords) is None
@@ -0,0 +1,216 @@
+﻿"""Weather tool tests.
+
+HTTP is replaced with in-process fakes so no external API calls are made.
+"""
+
+import asyncio
+from typing import Any
+
+import httpx
+import pytest
+
+import tools.weather as weather
+from tools.weather import (
+    BatchWeatherResponse,
+    BatchWeatherTool,
+    CurrentWeatherResponse,
+    ForecastResponse,
+    ForecastTool,
+    WeatherClient,
+    WeatherTool,
+)
+
+CURRENT_PAYLOAD = {
+    "location": {"name": "Tokyo", "region": "Tokyo", "country": "Japan", "localtime": "2024-01-01 12:00"},
+    "current": {"temp_c": 10.0, "temp_f": 50.0, "humidity": 40, "condition": {"text": "Sunny"}},
+}
+FORECAST_PAYLOAD = {
+    "location": {"name": "Tokyo"},
+    "forecast": {"forecastday": [{"date": "2024-01-01", "day": {"maxtemp_c": 12.0, "condition": {"text": "Rain"}}}]},
+}
+
+
+class FakeSession:
+    def __init__(self, payload: dict[str, Any], status_code: int = 200) -> None:
+        self._payload = payload
+        self._status_code = status_code
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+
+    def get(self, url: str, params: dict[str, Any], timeout: int) -> httpx.Response:
+        self.calls.append((url, params))
+        return httpx.Response(self._status_code, json=self._payload)
+
+
+def _use_async_payload(monkeypatch: pytest.MonkeyPatch, payload: dict[str, Any], calls: list[str]) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        return httpx.Response(200, json=payload)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(weather, "get_async_http_client", lambda: client)
+
+
+def test_current_weather_normalized(monkeypatch: pytest.MonkeyPatch) -> None:
+    session = FakeSession(CURRENT_PAYLOAD)
+    monkeypatch.setattr(weather, "get_http_session", lambda: session)
+
+    result = WeatherTool(WeatherClient("k", "https://api.test/v1/")).execute("Tokyo")
+
+    assert result["temperature_c"] == 10.0
+    assert result["condition"] == "Sunny"
+    assert result["location"]["country"] == "Japan"
+    assert session.calls[0] == ("https://api.test/v1/current.json", {"key": "k", "aqi": "no", "q": "Tokyo"})
+    # Output is returned without per-call validation; it must still match the documented schema.
+    assert CurrentWeatherResponse(**result).model_dump() == result
+
+
+def test_upstream_error_message_raised(monkeypatch: pytest.MonkeyPatch) -> None:
+    session = FakeSession({"error": {"message": "No matching location found."}}, status_code=400)
+    monkeypatch.setattr(weather, "get_http_session", lambda: session)
+
+    with pytest.raises(RuntimeError, match="No matching location found"):
+        WeatherTool(WeatherClient("k", "https://api.test/v1")).execute("Nowhere")
+
+
+@pytest.mark.parametrize("location", ["", "   ", "x" * 200, "Tokyo; DROP TABLE", "http://evil.test/?a=b"])
+def test_invalid_location_rejected_without_request(monkeypatch: pytest.MonkeyPatch, location: str) -> None:
+    session = FakeSession(CURRENT_PAYLOAD)
+    monkeypatch.setattr(weather, "get_http_session", lambda: session)
+
+    with pytest.raises(ValueError, match="Invalid location"):
+        WeatherTool(WeatherClient("k", "https://api.test/v1")).execute(location)
+    assert session.calls == []
+
+
+def test_forecast_aexecute_matches_execute(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(weather, "get_http_session", lambda: FakeSession(FORECAST_PAYLOAD))
+    calls: list[str] = []
+    _use_async_payload(monkeypatch, FORECAST_PAYLOAD, calls)
+    tool = ForecastTool(WeatherClient("k", "https://api.test/v1"))
+
+    result = asyncio.run(tool.aexecute("Tokyo", days=5))
+
+    assert result == tool.execute("Tokyo", days=5)
+    assert result["days"][0]["condition"] == "Rain"
+    assert ForecastResponse(**result).model_dump() == result
+    assert "days=3" in calls[0]
+
+
+def test_repeated_query_served_from_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    session = FakeSession(CURRENT_PAYLOAD)
+    monkeypatch.setattr(weather, "get_http_session", lambda: session)
+    tool = WeatherTool(WeatherClient("k", "https://api.test/v1"))
+
+    tool.execute("Tokyo")
+    tool.execute(" tokyo ")
+
+    assert len(session.calls) == 1
+
+
+def test_stale_payload_served_when_api_unreachable(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(weather, "get_http_session", lambda: FakeSession(CURRENT_PAYLOAD))
+    tool = WeatherTool(WeatherClient("k", "https://api.test/v1"))
+    fresh = tool.execute("Tokyo")
+
+    class DownSession:
+        def get(self, *args: Any, **kwargs: Any) -> None:
+            raise weather.requests.ConnectionError("down")
+
+    monkeypatch.setattr(weather, "get_http_session", lambda: DownSession())
+    # Expire every cached entry.
+    for key, (_, data) in list(tool._client._cache.items()):
+        tool._client._cache[key] = (0.0, data)
+
+    assert tool.execute("Tokyo") == fresh
+
+
+def test_forecast_cache_drops_hourly_blocks(monkeypatch: pytest.MonkeyPatch) -> None:
+    payload = {
+        "location": {"name": "Tokyo"},
+        "forecast": {"forecastday": [{"date": "2024-01-01", "day": {}, "astro": {}, "hour": [{"temp_c": 1.0}]}]},
+    }
+    session = FakeSession(payload)
+    monkeypatch.setattr(weather, "get_http_session", lambda: session)
+    tool = ForecastTool(WeatherClient("k", "https://api.test/v1"))
+
+    tool.execute("Tokyo", days=1)
+
+    assert session.calls[0][1]["hour"] == 0
+    (_, cached), = tool._client._cache.values()
+    assert cached["forecast"]["forecastday"][0].keys() == {"date", "day"}
+
+
+def test_batch_reports_per_city_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    class PartialSession(FakeSession):
+        def get(self, url: str, params: dict[str, Any], timeout: int) -> httpx.Response:
+            if params["q"] == "Nowhere":
+                return httpx.Response(400, json={"error": {"message": "No matching location found."}})
+            return super().get(url, params, timeout)
+
+    monkeypatch.setattr(weather, "get_http_session", lambda: PartialSession(CURRENT_PAYLOAD))
+    calls: list[str] = []
+    _use_async_payload(monkeypatch, CURRENT_PAYLOAD, calls)
+    tool = BatchWeatherTool(WeatherTool(WeatherClient("k", "https://api.test/v1")))
+
+    result = tool.execute(["Tokyo", "Nowhere"])
+
+    assert [item["location"] for item in result["results"]] == ["Tokyo", "Nowhere"]
+    assert result["results"][0]["result"]["condition"] == "Sunny"
+    assert "No matching location" in result["results"][1]["error"]
+    BatchWeatherResponse(**result)
+
+    fresh_tool = BatchWeatherTool(WeatherTool(WeatherClient("k", "https://api.test/v1")))
+    async_result = asyncio.run(fresh_tool.aexecute(["Tokyo", "Paris"]))
+    assert len(async_result["results"]) == 2 and len(calls) == 2
+
+
+def test_concurrent_misses_share_one_request(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+
+    async def slow_handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        await asyncio.sleep(0.01)  # Keep the first request in flight while the second misses.
+        return httpx.Response(200, json=CURRENT_PAYLOAD)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(slow_handler))
+    monkeypatch.setattr(weather, "get_async_http_client", lambda: client)
+    tool = WeatherTool(WeatherClient("k", "https://api.test/v1"))
+
+    async def run_both() -> list[dict[str, Any]]:
+        return await asyncio.gather(tool.aexecute("Tokyo"), tool.aexecute("tokyo"))
+
+    first, second = asyncio.run(run_both())
+
+    assert first == second
+    assert len(calls) == 1
+
+
+def test_async_clients_closed_when_loop_changes() -> None:
+    async def grab(settle: bool) -> httpx.AsyncClient:
+        client = weather.get_async_http_client()
+        if settle:
+            await asyncio.sleep(0)  # Let the background close of stale clients run.
+        return client
+
+    first = asyncio.run(grab(settle=False))
+    second = asyncio.run(grab(settle=True))
+    assert first is not second and first.is_closed
+
+    async def shutdown() -> httpx.AsyncClient:
+        current = weather.get_async_http_client()
+        await weather.aclose_async_http_clients()
+        return current
+
+    assert asyncio.run(shutdown()).is_closed
+    assert second.is_closed and not weather._async_clients
+
+
+def test_batch_treats_bare_string_as_one_city(monkeypatch: pytest.MonkeyPatch) -> None:
+    session = FakeSession(CURRENT_PAYLOAD)
+    monkeypatch.setattr(weather, "get_http_session", lambda: session)
+    tool = BatchWeatherTool(WeatherTool(WeatherClient("k", "https://api.test/v1")))
+
+    result = tool.execute("Paris")
+
+    assert [item["location"] for item in result["results"]] == ["Paris"]
+    assert [params["q"] for _, params in session.calls] == ["Paris"]
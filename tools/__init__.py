@@ -4,6 +4,6 @@ This keeps public tool classes in one import location.
 """
 
 from .registry import ToolRegistry
-from .weather import ForecastTool, WeatherTool
+from .weather import BatchWeatherTool, ForecastTool, WeatherClient, WeatherTool
 
-__all__ = ["ToolRegistry", "WeatherTool", "ForecastTool"]
+__all__ = ["ToolRegistry", "WeatherTool", "ForecastTool", "BatchWeatherTool", "WeatherClient"]
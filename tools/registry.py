@@ -11,6 +11,7 @@ Responsibilities:
 This keeps the agent loop simple and predictable.
 """
 
+import asyncio
 import logging
 from typing import Any, Iterable, Protocol
 
@@ -32,26 +33,41 @@ class ToolProtocol(Protocol):
     def execute(self, **kwargs: Any) -> dict[str, Any]:
         ...
 
+    # Tools may also define `async def aexecute(**kwargs)` for non-blocking I/O;
+    # `ToolRegistry.aexecute` falls back to running `execute` in a thread.
+
 
 class ToolRegistry:
     def __init__(self, tools: Iterable[ToolProtocol]) -> None:
         self._logger = logging.getLogger("agent.tools.registry")
         # Map by tool name for O(1) lookup when model requests function call.
         self._tools = {tool.name: tool for tool in tools}
+        # Declarations are static per registry; built once on first use.
+        self._built_tools: list[types.Tool] | None = None
+        self._description: dict[str, dict[str, Any]] | None = None
         self._logger.info("ToolRegistry initialized with tools=%s", list(self._tools.keys()))
 
     def build_tools(self) -> list[types.Tool]:
         """Convert python tools into Gemini declarations list.
 
         Gemini expects function declarations (name/schema/description), not python callables.
+        The result is memoized because the registry does not change after init.
         """
-        declarations = [tool.declaration() for tool in self._tools.values()]
-        self._logger.debug("Built %s tool declarations", len(declarations))
-        return [types.Tool(function_declarations=declarations)]
+        if self._built_tools is None:
+            declarations = [tool.declaration() for tool in self._tools.values()]
+            self._logger.debug("Built %s tool declarations", len(declarations))
+            self._built_tools = [types.Tool(function_declarations=declarations)]
+        return self._built_tools
+
+    def names(self) -> list[str]:
+        """Return registered tool names in registration order."""
+        return list(self._tools)
 
     def describe(self) -> dict[str, dict[str, Any]]:
         """Return tool input/output schemas for documentation or debugging.
 
+        Schemas are static, so the result is built once and reused.
+
         Output example:
             {
                 "get_current_weather": {
@@ -60,14 +76,17 @@ class ToolRegistry:
                 }
             }
         """
-        description: dict[str, dict[str, Any]] = {}
-        for name, tool in self._tools.items():
-            declaration = tool.declaration()
-            description[name] = {
-                "input_schema": declaration.parameters_json_schema or {},
-                "output_schema": tool.output_schema(),
+        if self._description is None:
+            # Reuse the memoized declarations instead of building them again.
+            declarations = self.build_tools()[0].function_declarations or []
+            self._description = {
+                declaration.name: {
+                    "input_schema": declaration.parameters_json_schema or {},
+                    "output_schema": self._tools[declaration.name].output_schema(),
+                }
+                for declaration in declarations
             }
-        return description
+        return self._description
 
     def execute(self, name: str, args: dict[str, Any]) -> dict[str, Any]:
         """Execute one tool call and normalize output shape.
@@ -90,3 +109,27 @@ class ToolRegistry:
             # Keep error text short and safe to send back to model.
             self._logger.exception("Tool execution failed: %s", name)
             return {"error": str(exc)}
+
+    async def aexecute(self, name: str, args: dict[str, Any]) -> dict[str, Any]:
+        """Async variant of `execute` with the same result/error shapes.
+
+        Uses the tool's `aexecute` when it has one, so concurrent calls overlap on
+        the event loop; otherwise the blocking `execute` runs in a worker thread.
+        """
+        tool = self._tools.get(name)
+        if tool is None:
+            self._logger.warning("Unknown tool requested: %s", name)
+            return {"error": f"Unknown tool: {name}"}
+
+        try:
+            aexecute = getattr(tool, "aexecute", None)
+            if aexecute is not None:
+                result = await aexecute(**args)
+            else:
+                result = await asyncio.to_thread(tool.execute, **args)
+            self._logger.debug("Tool executed successfully: %s", name)
+            return {"result": result}
+        except Exception as exc:
+            # Keep error text short and safe to send back to model.
+            self._logger.exception("Tool execution failed: %s", name)
+            return {"error": str(exc)}
@@ -3,26 +3,145 @@
 """Weather tools backed by WeatherAPI.
 
 Includes:
-1) WeatherTool: current weather.
-2) ForecastTool: forecast up to 3 days.
+1) WeatherClient: WeatherAPI HTTP access + response cache shared by the tools.
+2) WeatherTool: current weather.
+3) ForecastTool: forecast up to 3 days.
+4) BatchWeatherTool: current weather for several cities in one tool call.
 
 The tools:
 - declare JSON input schemas so Gemini knows how to call them,
-- validate and normalize outputs with Pydantic models,
+- normalize outputs into the shape described by the Pydantic models,
 - expose output schemas for documentation and debugging.
+
+The normalized dicts are built from our own mapping code, so they are returned
+as is; the models are used for `output_schema()` only, not per call.
 """
 
+import asyncio
+import functools
+import importlib.util
 import logging
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
 from typing import Any
 
+import httpx
+import orjson
 import requests
 from google.genai import types
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+
+_LOGGER = logging.getLogger("agent.tools.weather")
+
+# Process-wide HTTP session shared by all weather tools (see `get_http_session`).
+_shared_session: requests.Session | None = None
+_shared_session_lock = Lock()
+
+
+def get_http_session() -> requests.Session:
+    """Return the shared WeatherAPI session, creating it on first use.
+
+    One session keeps TCP/TLS connections alive across tool calls, and the
+    pool is sized for parallel tool calls within a model turn.
+    Transient 429/5xx responses are retried twice with a short backoff; the
+    final response is still returned so `_request` can report the error.
+    Accept-Encoding lists every codec urllib3 can decode here, so Brotli is
+    requested when `brotli`/`brotlicffi` is installed (requests only sends gzip, deflate).
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            retry = Retry(
+                total=2,
+                backoff_factor=0.2,
+                status_forcelist=(429, 500, 502, 503, 504),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+            session = requests.Session()
+            session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _shared_session = session
+        return _shared_session
+
+
+# Async clients are bound to the event loop that created them, so one is kept per loop.
+_async_clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+# Strong refs to pending close tasks so they are not garbage-collected mid-close.
+_closing_tasks: set[asyncio.Task[None]] = set()
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Return the WeatherAPI async client for the running event loop.
+
+    Used by `aexecute` so parallel tool calls overlap on the loop instead of
+    holding one worker thread each. HTTP/2 is enabled when `h2` is installed;
+    httpx already advertises Brotli when a decoder is installed.
+    Connection errors are retried twice by the transport.
+    Clients left behind by closed loops are closed from the current loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        # Release clients of loops that are gone (e.g. earlier asyncio.run calls).
+        for stale in _pop_stale_clients():
+            task = loop.create_task(_aclose_quietly(stale))
+            _closing_tasks.add(task)
+            task.add_done_callback(_closing_tasks.discard)
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            http2=importlib.util.find_spec("h2") is not None,
+            retries=2,
+        )
+        client = httpx.AsyncClient(transport=transport, timeout=10.0)
+        _async_clients[loop] = client
+    return client
+
+
+async def aclose_async_http_clients() -> None:
+    """Close the running loop's client and any left by closed loops.
+
+    Call on application shutdown (see the FastAPI lifespan in api.py).
+    """
+    clients = _pop_stale_clients()
+    current = _async_clients.pop(asyncio.get_running_loop(), None)
+    if current is not None:
+        clients.append(current)
+    for client in clients:
+        await _aclose_quietly(client)
+
+
+def _pop_stale_clients() -> list[httpx.AsyncClient]:
+    stale_loops = [known for known in _async_clients if known.is_closed()]
+    return [_async_clients.pop(known) for known in stale_loops]
+
+
+async def _aclose_quietly(client: httpx.AsyncClient) -> None:
+    # Sockets of a closed loop may fail to shut down cleanly; the pool is released either way.
+    try:
+        await client.aclose()
+    except Exception as exc:
+        _LOGGER.debug("Closing WeatherAPI async client failed: %s", exc)
+
+
+# The models only back `output_schema()` (and tests); building their validators
+# is deferred to first use instead of paid at import.
+_DEFERRED = ConfigDict(defer_build=True)
 
 
 class LocationInfo(BaseModel):
     """Shared location payload used by weather tool responses."""
 
+    model_config = _DEFERRED
+
     name: str | None = None
     region: str | None = None
     country: str | None = None
@@ -32,6 +151,8 @@ class LocationInfo(BaseModel):
 class CurrentWeatherResponse(BaseModel):
     """Normalized output schema for current weather."""
 
+    model_config = _DEFERRED
+
     location: LocationInfo
     temperature_c: float | None = None
     temperature_f: float | None = None
@@ -46,6 +167,8 @@ class CurrentWeatherResponse(BaseModel):
 class ForecastDay(BaseModel):
     """Normalized output schema for one forecast day."""
 
+    model_config = _DEFERRED
+
     date: str | None = None
     condition: str | None = None
     max_temp_c: float | None = None
@@ -59,79 +182,100 @@ class ForecastDay(BaseModel):
 class ForecastResponse(BaseModel):
     """Normalized output schema for multi-day forecast."""
 
+    model_config = _DEFERRED
+
     location: LocationInfo
     days: list[ForecastDay]
 
 
-class WeatherTool:
-    """Current weather tool.
+class BatchWeatherItem(BaseModel):
+    """Result for one city of a batch call; exactly one of result/error is set."""
 
-    Expected model call example:
-        {"location": "Tokyo"}
-    """
+    model_config = _DEFERRED
 
-    name = "get_current_weather"
+    location: str
+    result: CurrentWeatherResponse | None = None
+    error: str | None = None
 
-    def __init__(self, api_key: str, base_url: str) -> None:
-        self._api_key = api_key
-        self._base_url = base_url.rstrip("/")
-        self._logger = logging.getLogger("agent.tools.weather")
 
-    def declaration(self) -> types.FunctionDeclaration:
-        # Function schema visible to Gemini.
-        return types.FunctionDeclaration(
-            name=self.name,
-            description="Get the current weather for a city.",
-            parameters_json_schema={
-                "type": "object",
-                "properties": {
-                    "location": {
-                        "type": "string",
-                        "description": "City name, e.g. Boston, MA",
-                    }
-                },
-                "required": ["location"],
-            },
-        )
+class BatchWeatherResponse(BaseModel):
+    """Normalized output schema for multi-city current weather."""
 
-    def output_schema(self) -> dict[str, Any]:
-        """Return JSON schema for the tool output."""
-        return CurrentWeatherResponse.model_json_schema()
+    model_config = _DEFERRED
 
-    def execute(self, location: str) -> dict[str, Any]:
-        """Fetch and normalize current weather data."""
-        self._logger.info("WeatherTool.execute called: location=%s", location)
-        data = self._request("current.json", {"q": location, "aqi": "no"})
+    results: list[BatchWeatherItem]
 
-        location_data = data.get("location", {})
-        current = data.get("current", {})
-        condition = current.get("condition", {})
 
-        # Normalize raw response into a predictable shape for the model.
-        normalized = {
-            "location": {
-                "name": location_data.get("name"),
-                "region": location_data.get("region"),
-                "country": location_data.get("country"),
-                "localtime": location_data.get("localtime"),
-            },
-            "temperature_c": current.get("temp_c"),
-            "temperature_f": current.get("temp_f"),
-            "feels_like_c": current.get("feelslike_c"),
-            "feels_like_f": current.get("feelslike_f"),
-            "humidity": current.get("humidity"),
-            "condition": condition.get("text"),
-            "wind_kph": current.get("wind_kph"),
-            "wind_mph": current.get("wind_mph"),
-        }
+# Pre-flight check for `q`: names, "lat,lon", postcodes and WeatherAPI prefixes
+# such as "iata:DXB". Anything else fails locally instead of costing a request.
+_LOCATION_MAX_CHARS = 128
+_LOCATION_RE = re.compile(r"[\w\s,.'()/:+-]+")
 
-        # Validate and return a clean dict payload.
-        response = CurrentWeatherResponse(**normalized)
-        self._logger.debug("WeatherTool normalized payload keys=%s", list(normalized.keys()))
-        return response.model_dump()
 
-    def _request(self, endpoint: str, params: dict[str, Any]) -> dict[str, Any]:
-        """Issue HTTP request to WeatherAPI.
+def _clean_location(location: str) -> str:
+    """Return the stripped location or raise ValueError for obviously invalid input."""
+    cleaned = str(location).strip()
+    if not cleaned or len(cleaned) > _LOCATION_MAX_CHARS or _LOCATION_RE.fullmatch(cleaned) is None:
+        raise ValueError(f"Invalid location: {cleaned[:_LOCATION_MAX_CHARS]!r}")
+    return cleaned
+
+
+def _normalize_location(location_data: dict[str, Any]) -> dict[str, Any]:
+    """Shared location block of current-weather and forecast payloads."""
+    location_get = location_data.get
+    return {
+        "name": location_get("name"),
+        "region": location_get("region"),
+        "country": location_get("country"),
+        "localtime": location_get("localtime"),
+    }
+
+
+@functools.cache
+def _json_schema(model: type[BaseModel]) -> dict[str, Any]:
+    """Output JSON schema per model, computed on first request instead of every call."""
+    return model.model_json_schema()
+
+
+class WeatherClient:
+    """WeatherAPI access shared by the weather tools.
+
+    Owns the API key, endpoint URLs and the response cache, so one instance
+    injected into every tool gives them a single cache (the HTTP session and
+    async clients are already process-wide).
+    """
+
+    # Response cache: seconds a WeatherAPI payload stays fresh, per endpoint.
+    # Expired entries are kept (LRU-bounded) as a fallback when the API is unreachable.
+    _CACHE_TTLS = {"current.json": 60.0, "forecast.json": 1800.0}
+    _CACHE_MAX_ENTRIES = 256
+
+    # Fixed query params per endpoint; tools only pass the per-call ones (q, days).
+    # `hour=0` cuts the 24 hourly forecast entries per day down to one; we never read them.
+    _STATIC_PARAMS: dict[str, dict[str, Any]] = {
+        "current.json": {"aqi": "no"},
+        "forecast.json": {"aqi": "no", "alerts": "no", "hour": 0},
+    }
+
+    def __init__(self, api_key: str, base_url: str) -> None:
+        self._api_key = api_key
+        self._base_url = base_url.rstrip("/")
+        # Endpoint URLs and key + static params are fixed per instance; built once
+        # so each request only merges in its per-call params.
+        self._urls = {endpoint: f"{self._base_url}/{endpoint}" for endpoint in self._CACHE_TTLS}
+        self._base_params = {
+            endpoint: {"key": api_key, **static} for endpoint, static in self._STATIC_PARAMS.items()
+        }
+        # (endpoint, params) -> (expires_at, raw payload), most recently used last.
+        self._cache: OrderedDict[tuple[Any, ...], tuple[float, dict[str, Any]]] = OrderedDict()
+        self._cache_lock = Lock()
+        # Single-flight: concurrent misses for one key share a single upstream call.
+        # Guarded by `_cache_lock`; async tasks are keyed per event loop.
+        self._inflight: dict[tuple[Any, ...], Future[dict[str, Any]]] = {}
+        self._ainflight: dict[tuple[Any, ...], asyncio.Task[dict[str, Any]]] = {}
+
+    def _prepare(self, endpoint: str, params: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+        """Build URL + query params for a WeatherAPI call.
 
         Security:
         - API key is never written to logs.
@@ -139,35 +283,227 @@ class WeatherTool:
         if not self._api_key:
             raise RuntimeError("WEATHERAPI_KEY is not set.")
 
-        url = f"{self._base_url}/{endpoint}"
-        full_params = {"key": self._api_key, **params}
+        url = self._urls.get(endpoint) or f"{self._base_url}/{endpoint}"
+        # `params` never holds the key, so it is logged as is (formatted only if INFO is on).
+        _LOGGER.info("WeatherAPI request: url=%s params=%s", url, params)
+        return url, {**self._base_params.get(endpoint, {"key": self._api_key}), **params}
 
-        # Never log secrets.
-        safe_params = {k: v for k, v in full_params.items() if k != "key"}
-        self._logger.info("WeatherAPI request: url=%s params=%s", url, safe_params)
+    def request(self, endpoint: str, params: dict[str, Any]) -> dict[str, Any]:
+        """Issue HTTP request to WeatherAPI, serving fresh cached payloads first.
 
+        A caller that misses while the same query is already in flight waits for
+        that request instead of issuing its own.
+        """
+        key = self._cache_key(endpoint, params)
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached
+
+        with self._cache_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            data = self._fetch(endpoint, params, key)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            with self._cache_lock:
+                self._inflight.pop(key, None)
+
+    def _fetch(self, endpoint: str, params: dict[str, Any], key: tuple[Any, ...]) -> dict[str, Any]:
+        url, full_params = self._prepare(endpoint, params)
         try:
-            response = requests.get(url, params=full_params, timeout=10)
+            response = get_http_session().get(url, params=full_params, timeout=10)
         except requests.RequestException as exc:
-            raise RuntimeError(f"Weather API request failed: {exc}") from exc
+            return self._stale_or_raise(key, exc)
+        data = self._trim(endpoint, self._parse_response(response))
+        self._cache_store(key, endpoint, data)
+        return data
 
-        self._logger.info("WeatherAPI response: status=%s", response.status_code)
+    async def arequest(self, endpoint: str, params: dict[str, Any]) -> dict[str, Any]:
+        """Async variant of `request` over the shared httpx client.
+
+        Concurrent misses on one event loop await a single shared task; `shield`
+        keeps one cancelled caller from cancelling it for the others.
+        """
+        key = self._cache_key(endpoint, params)
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        task_key = (loop, *key)
+        with self._cache_lock:
+            task = self._ainflight.get(task_key)
+            if task is None:
+                task = loop.create_task(self._afetch(endpoint, params, key))
+                self._ainflight[task_key] = task
+                task.add_done_callback(lambda _: self._forget_task(task_key))
+        return await asyncio.shield(task)
+
+    def _forget_task(self, task_key: tuple[Any, ...]) -> None:
+        with self._cache_lock:
+            self._ainflight.pop(task_key, None)
+
+    async def _afetch(self, endpoint: str, params: dict[str, Any], key: tuple[Any, ...]) -> dict[str, Any]:
+        url, full_params = self._prepare(endpoint, params)
+        try:
+            response = await get_async_http_client().get(url, params=full_params)
+        except httpx.HTTPError as exc:
+            return self._stale_or_raise(key, exc)
+        data = self._trim(endpoint, self._parse_response(response))
+        self._cache_store(key, endpoint, data)
+        return data
+
+    def _trim(self, endpoint: str, data: dict[str, Any]) -> dict[str, Any]:
+        """Drop raw fields the tools never read before the payload is cached."""
+        if endpoint == "forecast.json":
+            for forecast_day in data.get("forecast", {}).get("forecastday", []):
+                forecast_day.pop("hour", None)
+                forecast_day.pop("astro", None)
+        return data
+
+    @staticmethod
+    def _cache_key(endpoint: str, params: dict[str, Any]) -> tuple[Any, ...]:
+        """Cache key without the API key; locations differing only in case share an entry."""
+        items = tuple(
+            sorted((name, value.strip().lower() if name == "q" else value) for name, value in params.items())
+        )
+        return endpoint, items
+
+    def _cache_lookup(self, key: tuple[Any, ...]) -> dict[str, Any] | None:
+        """Return a fresh cached payload, or None."""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            self._cache.move_to_end(key)
+        _LOGGER.debug("WeatherAPI cache hit: endpoint=%s", key[0])
+        return entry[1]
+
+    def _cache_store(self, key: tuple[Any, ...], endpoint: str, data: dict[str, Any]) -> None:
+        ttl = self._CACHE_TTLS.get(endpoint, 60.0)
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + ttl, data)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    def _stale_or_raise(self, key: tuple[Any, ...], exc: Exception) -> dict[str, Any]:
+        """On network failure, fall back to an expired cached payload if one exists."""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+        if entry is not None:
+            _LOGGER.warning("WeatherAPI unreachable; serving stale cached payload: %s", exc)
+            return entry[1]
+        raise RuntimeError(f"Weather API request failed: {exc}") from exc
+
+    def _parse_response(self, response: requests.Response | httpx.Response) -> dict[str, Any]:
+        """Decode a WeatherAPI response or raise with the upstream error message.
+
+        requests and httpx responses expose the same status/content/text API.
+        The body is decoded from raw bytes, skipping `response.json()` charset detection.
+        """
+        _LOGGER.info("WeatherAPI response: status=%s", response.status_code)
 
         if response.status_code != 200:
             try:
-                payload = response.json()
+                payload = orjson.loads(response.content)
                 message = payload.get("error", {}).get("message") or payload.get("message")
             except ValueError:
                 message = response.text.strip()
             raise RuntimeError(f"Weather API error ({response.status_code}): {message or 'Unknown error'}")
 
         try:
-            return response.json()
+            return orjson.loads(response.content)
         except ValueError as exc:
             raise RuntimeError("Weather API returned non-JSON response") from exc
 
 
-class ForecastTool(WeatherTool):
+class WeatherTool:
+    """Current weather tool.
+
+    Expected model call example:
+        {"location": "Tokyo"}
+    """
+
+    name = "get_current_weather"
+
+    # Static per class: built once at import instead of on every declaration() call.
+    _DECLARATION = types.FunctionDeclaration(
+        name=name,
+        description="Get the current weather for a city.",
+        parameters_json_schema={
+            "type": "object",
+            "properties": {
+                "location": {
+                    "type": "string",
+                    "description": "City name, e.g. Boston, MA",
+                }
+            },
+            "required": ["location"],
+        },
+    )
+
+    def __init__(self, client: WeatherClient) -> None:
+        self._client = client
+
+    def declaration(self) -> types.FunctionDeclaration:
+        # Function schema visible to Gemini.
+        return self._DECLARATION
+
+    def output_schema(self) -> dict[str, Any]:
+        """Return JSON schema for the tool output (shared; do not mutate)."""
+        return _json_schema(CurrentWeatherResponse)
+
+    def execute(self, location: str) -> dict[str, Any]:
+        """Fetch and normalize current weather data."""
+        return self._normalize(self._client.request(*self._query(location)))
+
+    async def aexecute(self, location: str) -> dict[str, Any]:
+        """Async variant of `execute` used by the agent's async loop."""
+        return self._normalize(await self._client.arequest(*self._query(location)))
+
+    def _query(self, location: str) -> tuple[str, dict[str, Any]]:
+        """Return (endpoint, params) for one current-weather call."""
+        location = _clean_location(location)
+        _LOGGER.info("WeatherTool.execute called: location=%s", location)
+        return "current.json", {"q": location}
+
+    def _normalize(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Normalize a raw current-weather response into a predictable shape for the model."""
+        current = data.get("current", {})
+        # Bound .get is looked up once instead of per field.
+        current_get = current.get
+        condition = current_get("condition", {})
+
+        normalized = {
+            "location": _normalize_location(data.get("location", {})),
+            "temperature_c": current_get("temp_c"),
+            "temperature_f": current_get("temp_f"),
+            "feels_like_c": current_get("feelslike_c"),
+            "feels_like_f": current_get("feelslike_f"),
+            "humidity": current_get("humidity"),
+            "condition": condition.get("text"),
+            "wind_kph": current_get("wind_kph"),
+            "wind_mph": current_get("wind_mph"),
+        }
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("WeatherTool normalized payload keys=%s", list(normalized.keys()))
+        return normalized
+
+
+class ForecastTool:
     """Forecast tool for 1-3 days.
 
     Expected model call example:
@@ -176,77 +512,167 @@ class ForecastTool(WeatherTool):
 
     name = "get_weather_forecast"
 
-    def declaration(self) -> types.FunctionDeclaration:
-        return types.FunctionDeclaration(
-            name=self.name,
-            description="Get a weather forecast for up to 3 days for a city.",
-            parameters_json_schema={
-                "type": "object",
-                "properties": {
-                    "location": {
-                        "type": "string",
-                        "description": "City name, e.g. Boston, MA",
-                    },
-                    "days": {
-                        "type": "integer",
-                        "description": "Number of days for forecast (1-3).",
-                        "minimum": 1,
-                        "maximum": 3,
-                    },
+    _DECLARATION = types.FunctionDeclaration(
+        name=name,
+        description="Get a weather forecast for up to 3 days for a city.",
+        parameters_json_schema={
+            "type": "object",
+            "properties": {
+                "location": {
+                    "type": "string",
+                    "description": "City name, e.g. Boston, MA",
+                },
+                "days": {
+                    "type": "integer",
+                    "description": "Number of days for forecast (1-3).",
+                    "minimum": 1,
+                    "maximum": 3,
                 },
-                "required": ["location"],
             },
-        )
+            "required": ["location"],
+        },
+    )
+
+    def __init__(self, client: WeatherClient) -> None:
+        self._client = client
+
+    def declaration(self) -> types.FunctionDeclaration:
+        # Function schema visible to Gemini.
+        return self._DECLARATION
 
     def output_schema(self) -> dict[str, Any]:
-        """Return JSON schema for the tool output."""
-        return ForecastResponse.model_json_schema()
+        """Return JSON schema for the tool output (shared; do not mutate)."""
+        return _json_schema(ForecastResponse)
 
     def execute(self, location: str, days: int = 3) -> dict[str, Any]:
-        """Fetch and normalize forecast data.
+        """Fetch and normalize forecast data."""
+        return self._normalize(self._client.request(*self._query(location, days)))
+
+    async def aexecute(self, location: str, days: int = 3) -> dict[str, Any]:
+        """Async variant of `execute` used by the agent's async loop."""
+        return self._normalize(await self._client.arequest(*self._query(location, days)))
+
+    def _query(self, location: str, days: int = 3) -> tuple[str, dict[str, Any]]:
+        """Return (endpoint, params) for one forecast call.
 
         We clamp `days` to 1..3 to keep behavior deterministic,
         even if model provides out-of-range values.
         """
+        location = _clean_location(location)
         safe_days = max(1, min(3, int(days)))
-        self._logger.info("ForecastTool.execute called: location=%s days=%s", location, safe_days)
+        _LOGGER.info("ForecastTool.execute called: location=%s days=%s", location, safe_days)
+        return "forecast.json", {"q": location, "days": safe_days}
 
-        data = self._request(
-            "forecast.json",
-            {"q": location, "days": safe_days, "aqi": "no", "alerts": "no"},
-        )
-
-        location_data = data.get("location", {})
+    def _normalize(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Normalize forecast into a compact, stable payload."""
         forecast_days = data.get("forecast", {}).get("forecastday", [])
 
         normalized_days: list[dict[str, Any]] = []
         for forecast_day in forecast_days:
-            day_data = forecast_day.get("day", {})
-            condition = day_data.get("condition", {})
+            # Bound .get is looked up once per day instead of per field.
+            day_get = forecast_day.get("day", {}).get
+            condition = day_get("condition", {})
             normalized_days.append(
                 {
                     "date": forecast_day.get("date"),
                     "condition": condition.get("text"),
-                    "max_temp_c": day_data.get("maxtemp_c"),
-                    "min_temp_c": day_data.get("mintemp_c"),
-                    "max_temp_f": day_data.get("maxtemp_f"),
-                    "min_temp_f": day_data.get("mintemp_f"),
-                    "avg_humidity": day_data.get("avghumidity"),
-                    "chance_of_rain": day_data.get("daily_chance_of_rain"),
+                    "max_temp_c": day_get("maxtemp_c"),
+                    "min_temp_c": day_get("mintemp_c"),
+                    "max_temp_f": day_get("maxtemp_f"),
+                    "min_temp_f": day_get("mintemp_f"),
+                    "avg_humidity": day_get("avghumidity"),
+                    "chance_of_rain": day_get("daily_chance_of_rain"),
                 }
             )
 
-        # Normalize forecast into a compact, stable payload.
         normalized = {
-            "location": {
-                "name": location_data.get("name"),
-                "region": location_data.get("region"),
-                "country": location_data.get("country"),
-                "localtime": location_data.get("localtime"),
-            },
+            "location": _normalize_location(data.get("location", {})),
             "days": normalized_days,
         }
 
-        response = ForecastResponse(**normalized)
-        self._logger.debug("ForecastTool normalized %s day entries", len(normalized_days))
-        return response.model_dump()
+        _LOGGER.debug("ForecastTool normalized %s day entries", len(normalized_days))
+        return normalized
+
+
+class BatchWeatherTool:
+    """Current weather for several cities in one tool call.
+
+    Expected model call example:
+        {"locations": ["Tokyo", "Paris", "Berlin"]}
+
+    Cities are fetched concurrently (at most `_MAX_CONCURRENCY` at a time)
+    through a wrapped WeatherTool, so its cache is shared with single-city calls.
+    One failing city does not fail the batch; it gets an `error` entry instead.
+    """
+
+    name = "get_weather_batch"
+
+    _MAX_LOCATIONS = 10
+    _MAX_CONCURRENCY = 8
+
+    _DECLARATION = types.FunctionDeclaration(
+        name=name,
+        description="Get the current weather for several cities at once. Prefer this over repeated single-city calls.",
+        parameters_json_schema={
+            "type": "object",
+            "properties": {
+                "locations": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "City names, e.g. [\"Boston, MA\", \"Tokyo\"]",
+                    "minItems": 1,
+                    "maxItems": _MAX_LOCATIONS,
+                }
+            },
+            "required": ["locations"],
+        },
+    )
+
+    def __init__(self, weather_tool: WeatherTool) -> None:
+        self._weather_tool = weather_tool
+
+    def declaration(self) -> types.FunctionDeclaration:
+        # Function schema visible to Gemini.
+        return self._DECLARATION
+
+    def output_schema(self) -> dict[str, Any]:
+        """Return JSON schema for the tool output (shared; do not mutate)."""
+        return _json_schema(BatchWeatherResponse)
+
+    def execute(self, locations: list[str] | str) -> dict[str, Any]:
+        """Fetch current weather for all locations on a bounded thread pool."""
+        locations = self._clamp(locations)
+        workers = min(self._MAX_CONCURRENCY, len(locations)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self._fetch_one, locations))
+        return {"results": results}
+
+    async def aexecute(self, locations: list[str] | str) -> dict[str, Any]:
+        """Async variant of `execute`; concurrency is bounded by a semaphore."""
+        semaphore = asyncio.Semaphore(self._MAX_CONCURRENCY)
+
+        async def fetch(location: str) -> dict[str, Any]:
+            async with semaphore:
+                try:
+                    return {"location": location, "result": await self._weather_tool.aexecute(location)}
+                except Exception as exc:
+                    return {"location": location, "error": str(exc)}
+
+        results = await asyncio.gather(*(fetch(location) for location in self._clamp(locations)))
+        return {"results": list(results)}
+
+    def _clamp(self, locations: list[str] | str) -> list[str]:
+        """Keep at most `_MAX_LOCATIONS` entries, even if the model sends more.
+
+        A bare string is one city, not a sequence of single-letter lookups.
+        """
+        _LOGGER.info("BatchWeatherTool.execute called: locations=%s", locations)
+        if isinstance(locations, str):
+            locations = [locations]
+        return list(locations)[: self._MAX_LOCATIONS]
+
+    def _fetch_one(self, location: str) -> dict[str, Any]:
+        try:
+            return {"location": location, "result": self._weather_tool.execute(location)}
+        except Exception as exc:
+            return {"location": location, "error": str(exc)}